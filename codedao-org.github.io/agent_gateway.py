@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+🤖 CodeDAO AI Agent: Agent Gateway Client
+One client for the agent gateway's /api/user/add-github-token and
+/api/github/push endpoints.
+
+- Keep-alive: one pooled session for every call.
+- Token registration is idempotent: the SHA-256 of the last token
+  registered per gateway + user is remembered, and an unchanged token is
+  not sent again. The gateway forgetting it (restart) triggers one
+  re-registration.
+- Pushes to several repos run concurrently; push_many() yields results as
+  they finish.
+- Transient failures are retried with exponential backoff and full jitter.
+  Pushes are only retried when the gateway cannot have acted on them.
+
+    with AgentGatewayClient(user_id="ai-agent-codedao") as gateway:
+        gateway.register_token(os.environ["GITHUB_TOKEN"])
+        for result in gateway.push_many([("CodeDAO-org.github.io", files, "Deploy")]):
+            print(result.repo, result.ok)
+"""
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+DEFAULT_GATEWAY_URL = os.getenv("AGENT_GATEWAY_URL", "http://localhost:3001")
+DEFAULT_USER_ID = "ai-agent-codedao"
+DEFAULT_TIMEOUT = (5, 60)  # (connect, read) seconds
+REGISTRY_FILE = os.getenv("CODEDAO_GATEWAY_REGISTRY",
+                          os.path.join(os.path.expanduser("~"), ".cache", "codedao", "gateway-tokens.json"))
+LOOPBACK_HOSTS = {"localhost", "127.0.0.1", "::1"}
+RETRY_STATUSES = {429, 502, 503, 504}
+NOT_PROCESSED_STATUSES = {429, 503}  # Safe to resend a push
+
+PushResult = namedtuple("PushResult", "repo ok status_code data error elapsed")
+
+
+class GatewayError(Exception):
+    """The gateway rejected a request or could not be reached"""
+
+    def __init__(self, message, status_code=None, data=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.data = data
+
+
+class AgentGatewayClient:
+    """Pooled, retrying client for the CodeDAO agent gateway"""
+
+    def __init__(self, base_url=DEFAULT_GATEWAY_URL, user_id=DEFAULT_USER_ID, timeout=DEFAULT_TIMEOUT,
+                 retries=3, backoff=0.5, max_backoff=8.0, pool_size=8, registry_file=REGISTRY_FILE):
+        self.base_url = base_url.rstrip('/')
+        self.user_id = user_id
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.pool_size = pool_size
+        self.registry_file = registry_file
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            'Content-Type': 'application/json',
+            'User-Agent': 'CodeDAO-AI-Agent/1.0'
+        })
+        self._token = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.session.close()
+
+    @property
+    def is_loopback(self):
+        """True if the gateway runs on this machine (tokens never leave it)"""
+        return urlsplit(self.base_url).hostname in LOOPBACK_HOSTS
+
+    # ---- HTTP ----
+
+    def _sleep_before_retry(self, attempt, response=None):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = float(retry_after)
+        else:
+            # Full jitter: uniform in [0, backoff * 2^attempt], capped
+            delay = random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+        time.sleep(delay)
+
+    @staticmethod
+    def _never_sent(error):
+        """True if the connection failed before any of the request was sent"""
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        seen = set()
+        while error is not None and id(error) not in seen:
+            if isinstance(error, NewConnectionError):
+                return True
+            seen.add(id(error))
+            # requests wraps MaxRetryError, which keeps the urllib3 error in .reason
+            error = getattr(error, "reason", None) or error.__cause__ or next(
+                (arg for arg in error.args if isinstance(arg, BaseException)), None)
+        return False
+
+    def _post(self, path, payload, idempotent, timeout=None):
+        """POST JSON with retries; returns (status code, decoded body)"""
+        url = f"{self.base_url}{path}"
+        for attempt in range(self.retries + 1):
+            last = attempt == self.retries
+            try:
+                response = self.session.post(url, json=payload, timeout=timeout or self.timeout)
+            except requests.exceptions.ConnectionError as e:
+                # A reset or disconnect can come after the body was sent, so only
+                # connect-phase failures are safe to resend a push on
+                if last or not (idempotent or self._never_sent(e)):
+                    raise GatewayError(f"Could not connect to Agent Gateway at {self.base_url}: {e}")
+                self._sleep_before_retry(attempt)
+                continue
+            except requests.exceptions.Timeout as e:
+                if last or not idempotent:
+                    raise GatewayError(f"Agent Gateway timed out on {path}: {e}")
+                self._sleep_before_retry(attempt)
+                continue
+
+            retryable = response.status_code in (RETRY_STATUSES if idempotent else NOT_PROCESSED_STATUSES)
+            if retryable and not last:
+                self._sleep_before_retry(attempt, response)
+                continue
+            try:
+                data = response.json()
+            except ValueError:
+                data = {"error": response.text}
+            return response.status_code, data
+
+    # ---- Token registration ----
+
+    def _registry_key(self):
+        return f"{self.base_url}|{self.user_id}"
+
+    def _load_registry(self):
+        try:
+            with open(self.registry_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_registry(self, registry):
+        try:
+            os.makedirs(os.path.dirname(self.registry_file), mode=0o700, exist_ok=True)
+            tmp_path = f"{self.registry_file}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(registry, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.registry_file)
+        except OSError:
+            pass  # Only costs a redundant registration next time
+
+    def register_token(self, token, force=False):
+        """Register a GitHub token for this user unless the gateway already has it.
+
+        Returns True if it was sent, False if skipped as already registered.
+        Only the token's SHA-256 is stored locally.
+        """
+        token_hash = hashlib.sha256(token.encode('utf-8')).hexdigest()
+        with self._lock:
+            self._token = token
+            registry = self._load_registry()
+            if not force and registry.get(self._registry_key()) == token_hash:
+                return False
+            status, data = self._post("/api/user/add-github-token",
+                                      {"userId": self.user_id, "githubToken": token}, idempotent=True)
+            if status != 200:
+                raise GatewayError(f"Failed to add token: {status} - {data.get('error', data)}", status, data)
+            registry[self._registry_key()] = token_hash
+            self._save_registry(registry)
+            return True
+
+    def forget_registration(self):
+        """Make the next register_token() call send the token again"""
+        with self._lock:
+            registry = self._load_registry()
+            if registry.pop(self._registry_key(), None) is not None:
+                self._save_registry(registry)
+
+    # ---- Pushes ----
+
+    @staticmethod
+    def _files_payload(files):
+        if isinstance(files, dict):
+            files = [{"path": path, "content": content} for path, content in files.items()]
+        return [dict(f, content=f["content"].decode('utf-8') if isinstance(f["content"], bytes) else f["content"])
+                for f in files]
+
+    @staticmethod
+    def _auth_failure(status, data):
+        error = str(data.get("error", "")).lower() if isinstance(data, dict) else ""
+        return status in (401, 403) or ("token" in error and not data.get("success"))
+
+    def push(self, repo, files, commit_message, timeout=None):
+        """Push files ({path: content} or [{"path", "content"}]) to repo in one gateway call.
+
+        Returns the gateway's response body; raises GatewayError on failure.
+        """
+        payload = {
+            "userId": self.user_id,
+            "repo": repo,
+            "files": self._files_payload(files),
+            "commitMessage": commit_message
+        }
+        status, data = self._post("/api/github/push", payload, idempotent=False, timeout=timeout)
+        if self._auth_failure(status, data) and self._token:
+            # The gateway lost our token (e.g. restarted): register again once
+            self.register_token(self._token, force=True)
+            status, data = self._post("/api/github/push", payload, idempotent=False, timeout=timeout)
+        if status != 200 or not data.get("success"):
+            raise GatewayError(data.get("error", f"HTTP {status}"), status, data)
+        return data
+
+    def push_many(self, jobs, max_workers=None, timeout=None):
+        """Submit (repo, files, commit message) jobs concurrently; yields PushResult as each finishes"""
+        jobs = list(jobs)
+        if not jobs:
+            return
+
+        def run(job):
+            repo, files, message = job
+            started = time.perf_counter()
+            try:
+                data = self.push(repo, files, message, timeout)
+                return PushResult(repo, True, 200, data, None, time.perf_counter() - started)
+            except GatewayError as e:
+                return PushResult(repo, False, e.status_code, e.data, str(e), time.perf_counter() - started)
+
+        with ThreadPoolExecutor(max_workers=min(max_workers or self.pool_size, len(jobs))) as pool:
+            for future in as_completed([pool.submit(run, job) for job in jobs]):
+                yield future.result()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: uploading a large binary asset as a GitHub blob.
+
+Compares the old Contents-API style body (read the whole file, base64 it,
+embed it in a JSON dict) with the streamed Base64BlobBody, against a local
+stub that decodes the body incrementally and checks the bytes arrived intact.
+
+    python bench_github_push.py            # 200 MB asset
+    python bench_github_push.py 50         # size in MB
+"""
+
+import base64
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from github_push import CHUNK_SIZE, GitHubPusher
+
+CONTENT_MARKER = b'"content": "'
+
+
+class BlobSink(BaseHTTPRequestHandler):
+    """POST /repos/o/r/git/blobs: decodes the base64 content as it streams in,
+    answers {"sha": sha1 of the decoded bytes}"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        remaining = int(self.headers["Content-Length"])
+        digest = hashlib.sha1()
+        pending, carry, in_content = b"", b"", False
+        while remaining:
+            data = self.rfile.read(min(64 * 1024, remaining))
+            remaining -= len(data)
+            if not in_content:
+                pending += data
+                start = pending.find(CONTENT_MARKER)
+                if start < 0:
+                    pending = pending[-len(CONTENT_MARKER):]
+                    continue
+                data, pending, in_content = pending[start + len(CONTENT_MARKER):], b"", True
+            end = data.find(b'"')
+            encoded = carry + (data if end < 0 else data[:end])
+            usable = len(encoded) - len(encoded) % 4
+            digest.update(base64.b64decode(encoded[:usable]))
+            carry = encoded[usable:]
+            if end >= 0:
+                in_content = False
+                carry = b""
+        body = json.dumps({"sha": digest.hexdigest()}).encode()
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_asset(path, size):
+    """Incompressible binary file of `size` bytes; returns its sha1"""
+    digest = hashlib.sha1()
+    with open(path, 'wb') as f:
+        written = 0
+        while written < size:
+            chunk = os.urandom(min(CHUNK_SIZE, size - written))
+            f.write(chunk)
+            digest.update(chunk)
+            written += len(chunk)
+    return digest.hexdigest()
+
+
+def measure(fn):
+    """(seconds, peak traced MB, result) for one call"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main(size_mb=200):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), BlobSink)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    pusher = GitHubPusher("benchmark", "o", "r", branch="main",
+                          api_base=f"http://127.0.0.1:{server.server_port}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "asset.bin")
+        expected = make_asset(path, size_mb * 1024 * 1024)
+
+        def buffered():
+            # What ai-agent-direct-push.py used to do: whole file -> base64 -> JSON dict
+            with open(path, 'rb') as f:
+                content = f.read()
+            response = pusher.session.post(f"{pusher.repo_url}/git/blobs", timeout=300, json={
+                "content": base64.b64encode(content).decode('ascii'),
+                "encoding": "base64"
+            })
+            return response.json()["sha"]
+
+        def streamed():
+            return pusher.create_blob_from_file(path)[0]
+
+        print(f"github blob upload: {size_mb} MB binary asset")
+        peaks = {}
+        for name, fn in (("buffered base64 + JSON", buffered), ("streamed Base64BlobBody", streamed)):
+            elapsed, peaks[name], sha = measure(fn)
+            status = "ok" if sha == expected else "CORRUPTED"
+            print(f"  {name:26s}: {elapsed:6.2f} s, peak {peaks[name]:8.1f} MB  [{status}]")
+            if sha != expected:
+                return False
+    server.shutdown()
+    return peaks["streamed Base64BlobBody"] < peaks["buffered base64 + JSON"]
+
+
+if __name__ == "__main__":
+    ok = main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
+    sys.exit(0 if ok else "streamed upload did not use less memory")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+🤖 CodeDAO AI Agent: Deploy the Whole GitHub Pages Site
+Walks the site directory, hashes every file in parallel, uploads only
+the changed blobs concurrently and lands them as ONE commit.
+
+    python deploy_site.py                      # this directory -> CodeDAO-org.github.io
+    python deploy_site.py site/ --dry-run      # list what would change
+    python deploy_site.py --ignore "drafts/*" -m "Deploy site"
+"""
+
+import argparse
+import fnmatch
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from github_push import (MAX_WORKERS, REPO_NAME, REPO_OWNER, DeployManifest,
+                         GitHubPusher, GitHubPushError, get_github_token)
+
+# Never part of the published site
+DEFAULT_IGNORES = [
+    ".git", ".github", "__pycache__", "node_modules", ".DS_Store",
+    "*.py", "*.pyc", ".deploy-manifest.json*", "*.zip", ".env*",
+]
+
+
+def is_ignored(rel_path, ignores):
+    """True if the path or its last component matches any ignore glob"""
+    name = rel_path.rsplit("/", 1)[-1]
+    return any(fnmatch.fnmatch(rel_path, pattern) or fnmatch.fnmatch(name, pattern)
+               for pattern in ignores)
+
+
+def walk_site(root, ignores=DEFAULT_IGNORES):
+    """{repo path: local path} for every file under root that is not ignored"""
+    files = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root).replace(os.sep, "/")
+        rel_dir = "" if rel_dir == "." else rel_dir + "/"
+        # Prune ignored directories so they are never walked
+        dirnames[:] = sorted(d for d in dirnames if not is_ignored(rel_dir + d, ignores))
+        for filename in filenames:
+            rel_path = rel_dir + filename
+            if not is_ignored(rel_path, ignores):
+                files[rel_path] = os.path.join(dirpath, filename)
+    return files
+
+
+class ProgressReporter:
+    """Prints per-stage progress with files/s and MB/s"""
+
+    def __init__(self, stream=sys.stdout, interval=0.5):
+        self.stream = stream
+        self.interval = interval
+        self.stages = {}  # stage -> [started, done, total, bytes, last printed, finished]
+        self._lock = threading.Lock()
+
+    def __call__(self, stage, done, total, nbytes):
+        with self._lock:
+            now = time.perf_counter()
+            if done == 0:
+                self.stages[stage] = [now, 0, total, 0, now, None]
+                return
+            state = self.stages[stage]
+            state[1] = done
+            state[3] += nbytes
+            if done == total:
+                state[5] = now
+                self._print(stage, end="\n")
+            elif now - state[4] >= self.interval:
+                state[4] = now
+                self._print(stage, end="\r")
+
+    def rates(self, stage):
+        """(files, bytes, seconds, files/s, MB/s) for a stage"""
+        started, done, _, nbytes, _, finished = self.stages[stage]
+        elapsed = max((finished or time.perf_counter()) - started, 1e-6)
+        return done, nbytes, elapsed, done / elapsed, nbytes / elapsed / (1024 * 1024)
+
+    def _print(self, stage, end):
+        done, nbytes, elapsed, files_per_s, mb_per_s = self.rates(stage)
+        total = self.stages[stage][2]
+        self.stream.write(f"   {stage:7s} {done:5d}/{total:<5d} {nbytes / (1024 * 1024):8.2f} MB "
+                          f"{elapsed:6.1f}s  {files_per_s:7.1f} files/s  {mb_per_s:6.2f} MB/s{end}")
+        self.stream.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deploy a site directory to GitHub Pages as one commit")
+    parser.add_argument("root", nargs="?", default=os.path.dirname(os.path.abspath(__file__)),
+                        help="Local site directory (default: this directory)")
+    parser.add_argument("-m", "--message", default="🤖 AI Agent: Deploy CodeDAO site")
+    parser.add_argument("--ignore", action="append", default=[], metavar="GLOB",
+                        help="Extra ignore glob (repeatable)")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="Hash/upload threads")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what changed")
+    parser.add_argument("--owner", default=REPO_OWNER)
+    parser.add_argument("--repo", default=REPO_NAME)
+    parser.add_argument("--branch", default=None)
+    args = parser.parse_args()
+
+    print("🤖 CodeDAO AI Agent: Site Deploy")
+    print("=" * 50)
+
+    files = walk_site(args.root, DEFAULT_IGNORES + args.ignore)
+    if not files:
+        print(f"❌ No files to deploy under {args.root}")
+        return 1
+    print(f"📁 {len(files)} file(s) under {args.root}")
+
+    token = get_github_token(args.owner, args.repo)
+    if not token:
+        print("❌ No GitHub token found in environment or git credentials")
+        return 1
+
+    pusher = GitHubPusher(token, args.owner, args.repo, args.branch, max_workers=args.workers)
+    progress = ProgressReporter()
+    started = time.perf_counter()
+    try:
+        commit_sha, changed = pusher.push_changed(files, args.message, DeployManifest(),
+                                                  progress=progress, dry_run=args.dry_run)
+    except GitHubPushError as e:
+        print(f"\n❌ {e}")
+        return 1
+    elapsed = time.perf_counter() - started
+
+    if args.dry_run:
+        print(f"📝 {len(changed)} file(s) would change:")
+        for path in changed:
+            print(f"   • {path}")
+    elif commit_sha is None:
+        print("✅ Site already up to date - nothing pushed")
+    else:
+        count, nbytes, upload_s, files_per_s, mb_per_s = progress.rates("upload")
+        print(f"🎉 SUCCESS! {count} changed file(s), {nbytes / (1024 * 1024):.2f} MB "
+              f"({files_per_s:.1f} files/s, {mb_per_s:.2f} MB/s) in one commit: {commit_sha[:8]}...")
+        if args.repo.lower().endswith(".github.io"):
+            print(f"🔗 URL: https://{args.repo.lower()}/")
+    print(f"⏱️  Total {elapsed:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+🤖 CodeDAO AI Agent: Shared GitHub Credential Resolver
+One token lookup for every push script.
+
+GITHUB_TOKEN / GH_TOKEN win and are never stored. Otherwise the slow
+sources (remote URL, ``git credential fill``, ``gh auth token``) run in
+parallel and the first token found is used. It is cached in memory and,
+unless CODEDAO_TOKEN_CACHE=none, in the OS keyring (``pip install
+keyring``) or a 0600 file under ~/.cache/codedao - also used when the
+keyring has no backend - for CODEDAO_TOKEN_CACHE_TTL seconds, so the
+subprocesses run once per session, not once per deploy.
+
+    python github_credentials.py           # show where the token comes from
+    python github_credentials.py --forget  # drop the cached token
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+REPO_OWNER = "CodeDAO-org"
+REPO_NAME = "CodeDAO-org.github.io"
+CACHE_TTL = int(os.getenv("CODEDAO_TOKEN_CACHE_TTL", str(8 * 3600)))
+CACHE_BACKEND = os.getenv("CODEDAO_TOKEN_CACHE", "auto").lower()  # auto | keyring | file | none
+CACHE_FILE = os.getenv("CODEDAO_TOKEN_CACHE_FILE",
+                       os.path.join(os.path.expanduser("~"), ".cache", "codedao", "github-token.json"))
+KEYRING_SERVICE = "codedao-github"
+SOURCE_TIMEOUT = 10
+
+_memory = {}  # "token", "source", "expires"
+_lock = threading.Lock()
+
+
+# ---- Sources: each returns a token or None ----
+
+def _from_remote_url():
+    """Token embedded in the origin URL (https://ghp_...@github.com/...)"""
+    result = subprocess.run(['git', 'config', '--get', 'remote.origin.url'],
+                            capture_output=True, text=True, timeout=5)
+    url = result.stdout.strip()
+    if '@github.com' in url and '://' in url:
+        token_part = url.split('://')[1].split('@')[0].split(':')[-1]
+        if token_part.startswith(('ghp_', 'github_pat_', 'gho_')):
+            return token_part
+    return None
+
+
+def _from_git_credential(owner=REPO_OWNER, repo=REPO_NAME):
+    """Password the git credential helper has for github.com"""
+    cred_input = f"protocol=https\nhost=github.com\npath={owner}/{repo}\n\n"
+    result = subprocess.run(['git', 'credential', 'fill'], input=cred_input,
+                            capture_output=True, text=True, timeout=SOURCE_TIMEOUT,
+                            env=dict(os.environ, GIT_TERMINAL_PROMPT='0'))
+    if result.returncode == 0:
+        for line in result.stdout.split('\n'):
+            if line.startswith('password='):
+                return line.split('=', 1)[1] or None
+    return None
+
+
+def _from_gh_cli():
+    """Token of the GitHub CLI's logged-in account"""
+    result = subprocess.run(['gh', 'auth', 'token'], capture_output=True, text=True, timeout=SOURCE_TIMEOUT)
+    if result.returncode == 0:
+        return result.stdout.strip() or None
+    return None
+
+
+SOURCES = {
+    "remote-url": _from_remote_url,
+    "git-credential": _from_git_credential,
+    "gh-cli": _from_gh_cli,
+}
+
+
+def _first_success(owner, repo):
+    """(token, source) from whichever source answers first with a token"""
+    pool = ThreadPoolExecutor(max_workers=len(SOURCES))
+    pending = {}
+    for name, source in SOURCES.items():
+        args = (owner, repo) if source is _from_git_credential else ()
+        pending[pool.submit(source, *args)] = name
+    try:
+        while pending:
+            done, _ = wait(pending, timeout=SOURCE_TIMEOUT + 5, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    token = future.result()
+                except Exception:  # Missing binary, timeout, ...
+                    token = None
+                if token:
+                    return token, name
+        return None, None
+    finally:
+        # Don't wait for slower sources once one has answered
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ---- Persistent cache ----
+
+def _keyring():
+    if CACHE_BACKEND not in ("auto", "keyring"):
+        return None
+    try:
+        import keyring
+        return keyring
+    except ImportError:
+        return None
+
+
+def _read_file():
+    with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _write_file(raw):
+    os.makedirs(os.path.dirname(CACHE_FILE), mode=0o700, exist_ok=True)
+    tmp_path = f"{CACHE_FILE}.tmp"
+    # Created 0600 up front, so the token is never world-readable
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(raw)
+    os.replace(tmp_path, CACHE_FILE)
+
+
+def _load_cached():
+    if CACHE_BACKEND == "none":
+        return None
+    raw = None
+    keyring = _keyring()
+    try:
+        if keyring is not None:
+            try:
+                raw = keyring.get_password(KEYRING_SERVICE, "token")
+            except Exception:  # Installed without a usable backend: use the file
+                raw = _read_file()
+        elif CACHE_BACKEND in ("auto", "file"):
+            raw = _read_file()
+    except Exception:
+        return None
+    try:
+        entry = json.loads(raw) if raw else None
+    except ValueError:
+        return None
+    if not entry or entry.get("expires", 0) <= time.time() or not entry.get("token"):
+        return None
+    return entry
+
+
+def _store_cached(entry):
+    if CACHE_BACKEND == "none":
+        return
+    raw = json.dumps(entry)
+    keyring = _keyring()
+    try:
+        if keyring is not None:
+            try:
+                keyring.set_password(KEYRING_SERVICE, "token", raw)
+                return
+            except Exception:  # Installed without a usable backend: use the file
+                pass
+        elif CACHE_BACKEND not in ("auto", "file"):
+            return
+        _write_file(raw)
+    except Exception as e:
+        print(f"⚠️  Could not cache GitHub token: {e}", file=sys.stderr)
+
+
+def forget_github_token():
+    """Drop the cached token (e.g. after a 401) so the next lookup re-resolves"""
+    with _lock:
+        _memory.clear()
+        keyring = _keyring()
+        if keyring is not None:
+            try:
+                keyring.delete_password(KEYRING_SERVICE, "token")
+            except Exception:
+                pass
+        try:
+            # Also written when the keyring had no backend
+            os.remove(CACHE_FILE)
+        except OSError:
+            pass
+
+
+def resolve_github_token(owner=REPO_OWNER, repo=REPO_NAME, refresh=False):
+    """(token, source) - source is "env", "memory", "cache" or the source that found it"""
+    token = os.getenv('GITHUB_TOKEN') or os.getenv('GH_TOKEN')
+    if token:
+        return token, "env"
+
+    with _lock:
+        now = time.time()
+        if not refresh and _memory.get("expires", 0) > now:
+            return _memory["token"], "memory"
+        entry = None if refresh else _load_cached()
+        if entry is not None:
+            _memory.update(entry)
+            return entry["token"], "cache"
+
+        token, source = _first_success(owner, repo)
+        if token:
+            entry = {"token": token, "source": source, "expires": now + CACHE_TTL}
+            _memory.update(entry)
+            _store_cached(entry)
+        return token, source
+
+
+def get_github_token(owner=REPO_OWNER, repo=REPO_NAME):
+    """GitHub token from the environment, the cache, or the first local source that has one"""
+    return resolve_github_token(owner, repo)[0]
+
+
+if __name__ == "__main__":
+    if "--forget" in sys.argv[1:]:
+        forget_github_token()
+        print("🗑️  Cached GitHub token removed")
+        sys.exit(0)
+    started = time.perf_counter()
+    token, source = resolve_github_token(refresh="--refresh" in sys.argv[1:])
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if not token:
+        print("❌ No GitHub token found in environment, cache or git credentials")
+        sys.exit(1)
+    print(f"✅ Token {token[:4]}... from {source} ({elapsed_ms:.0f} ms)")
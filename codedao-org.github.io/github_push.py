@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+🤖 CodeDAO AI Agent: Batched GitHub Push (Git Data API)
+Shared by the push scripts: N files land as ONE commit.
+
+Blobs are uploaded in parallel, then one tree, one commit and one ref
+update - a fixed number of sequential round-trips however many files
+are pushed (the Contents API costs a GET + PUT + commit per file).
+
+Files are compared by git blob SHA-1 first: unchanged ones are never
+uploaded, and a push where nothing changed makes no commit. The local
+manifest remembers what was last deployed, so an unchanged deploy does
+not even call the API.
+
+Files are read in binary chunks and base64-encoded into the request body
+as it is sent, so memory stays flat however large the asset.
+
+    python github_push.py dashboard-working.html about.html -m "Deploy dashboard"
+"""
+
+import argparse
+import base64
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from github_credentials import forget_github_token, get_github_token  # noqa: F401 (re-exported for the scripts)
+
+REPO_OWNER = "CodeDAO-org"
+REPO_NAME = "CodeDAO-org.github.io"
+GITHUB_API_BASE = os.getenv("GITHUB_API_URL", "https://api.github.com")
+MAX_WORKERS = 8
+CHUNK_SIZE = 3 * 64 * 1024  # A multiple of 3, so per-chunk base64 concatenates without padding
+MANIFEST_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".deploy-manifest.json")
+
+
+class GitHubPushError(Exception):
+    """A Git Data API call failed"""
+
+    def __init__(self, response, step):
+        self.status_code = response.status_code
+        self.step = step
+        super().__init__(f"{step} failed ({response.status_code}): {response.text[:200]}")
+
+
+def git_blob_sha(content):
+    """SHA-1 git (and the GitHub API) would give these bytes as a blob"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    sha = hashlib.sha1(b"blob %d\0" % len(content))
+    sha.update(content)
+    return sha.hexdigest()
+
+
+def git_blob_sha_file(local_path, chunk_size=CHUNK_SIZE):
+    """git_blob_sha() of a file, read in chunks"""
+    with open(local_path, 'rb') as f:
+        sha = hashlib.sha1(b"blob %d\0" % os.fstat(f.fileno()).st_size)
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class Base64BlobBody:
+    """File-like ``{"encoding": "base64", "content": "..."}`` request body,
+    base64-encoded chunk by chunk as requests reads it.
+
+    Only one chunk is held at a time. ``__len__`` gives requests the exact
+    Content-Length, so the body is sent plainly rather than chunked.
+    """
+
+    PREFIX = b'{"encoding": "base64", "content": "'
+    SUFFIX = b'"}'
+
+    def __init__(self, fileobj, size, chunk_size=CHUNK_SIZE):
+        # Buffered binary reads return the full chunk until EOF, so every
+        # chunk but the last is a multiple of 3 bytes
+        assert chunk_size % 3 == 0
+        self.length = len(self.PREFIX) + 4 * ((size + 2) // 3) + len(self.SUFFIX)
+        self._parts = self._encode(fileobj, chunk_size)
+        self._part = b""
+        self._offset = 0
+
+    @classmethod
+    def _encode(cls, fileobj, chunk_size):
+        yield cls.PREFIX
+        for chunk in iter(lambda: fileobj.read(chunk_size), b""):
+            yield base64.b64encode(chunk)
+        yield cls.SUFFIX
+
+    def __len__(self):
+        return self.length
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            return b"".join(iter(lambda: self.read(CHUNK_SIZE), b""))
+        while self._offset >= len(self._part):
+            self._part = next(self._parts, None)
+            self._offset = 0
+            if self._part is None:
+                self._part = b""
+                return b""
+        data = self._part[self._offset:self._offset + size]
+        self._offset += len(data)
+        return data
+
+
+class DeployManifest:
+    """Local record of what was last deployed, per target.
+
+    ``{"targets": {target: {repo path: blob sha}}, "hashes": {local path:
+    [size, mtime_ns, sha]}}`` - the hash cache skips re-reading files whose
+    size and mtime have not changed.
+    """
+
+    def __init__(self, path=MANIFEST_FILE):
+        self.path = path
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            data = {}
+        self.targets = data.get("targets", {})
+        self.hashes = data.get("hashes", {})
+
+    def file_sha(self, local_path):
+        """Blob sha of a local file, re-hashed only if its size or mtime changed"""
+        stat = os.stat(local_path)
+        key = os.path.abspath(local_path)
+        cached = self.hashes.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        sha = git_blob_sha_file(local_path)
+        self.hashes[key] = [stat.st_size, stat.st_mtime_ns, sha]
+        return sha
+
+    def deployed(self, target):
+        """{repo path: blob sha} last deployed to target"""
+        return self.targets.get(target, {})
+
+    def unchanged(self, target, shas):
+        """True if every {repo path: sha} is exactly what was last deployed"""
+        deployed = self.deployed(target)
+        return all(deployed.get(path) == sha for path, sha in shas.items())
+
+    def record(self, target, shas):
+        self.targets.setdefault(target, {}).update(shas)
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"targets": self.targets, "hashes": self.hashes}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+class GitHubPusher:
+    """Commits a set of files to one branch through the Git Data API"""
+
+    def __init__(self, token, owner=REPO_OWNER, repo=REPO_NAME, branch=None,
+                 api_base=GITHUB_API_BASE, max_workers=MAX_WORKERS):
+        self.owner = owner
+        self.repo = repo
+        self.branch = branch
+        # Manifest key: the branch as requested, so it is stable before default_branch() resolves
+        self.target = f"{owner}/{repo}@{branch or 'default'}"
+        self.max_workers = max_workers
+        self.repo_url = f"{api_base.rstrip('/')}/repos/{owner}/{repo}"
+        self.session = requests.Session()
+        # One pooled connection per upload thread
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            'Authorization': f'token {token}',
+            'Accept': 'application/vnd.github.v3+json',
+            'User-Agent': 'CodeDAO-AI-Agent/1.0'
+        })
+
+    def _call(self, method, path, step, expected=(200, 201), **kwargs):
+        response = self.session.request(method, f"{self.repo_url}/{path}", timeout=30, **kwargs)
+        if response.status_code not in expected:
+            raise GitHubPushError(response, step)
+        return response.json()
+
+    def default_branch(self):
+        if self.branch is None:
+            self.branch = self._call("GET", "", "Repository lookup").get("default_branch", "main")
+        return self.branch
+
+    def head(self):
+        """(commit sha, tree sha) at the tip of the branch"""
+        ref = self._call("GET", f"git/ref/heads/{self.default_branch()}", "Ref lookup")
+        commit_sha = ref["object"]["sha"]
+        commit = self._call("GET", f"git/commits/{commit_sha}", "Commit lookup")
+        return commit_sha, commit["tree"]["sha"]
+
+    def create_blob(self, content):
+        """Upload one file's bytes; returns the blob sha"""
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        return self._post_blob(io.BytesIO(content), len(content))
+
+    def create_blob_from_file(self, local_path):
+        """Upload a file as a blob, streamed from disk; returns (blob sha, bytes sent)"""
+        with open(local_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            return self._post_blob(f, size), size
+
+    def _post_blob(self, fileobj, size):
+        blob = self._call("POST", "git/blobs", "Blob upload", data=Base64BlobBody(fileobj, size),
+                          headers={'Content-Type': 'application/json'})
+        return blob["sha"]
+
+    def create_blobs(self, files):
+        """Upload {path: bytes} in parallel; returns {path: blob sha}"""
+        return self._map(lambda path: (self.create_blob(files[path]), len(files[path])), files, "upload")
+
+    def _map(self, func, items, stage, progress=None):
+        """{item: value} for func(item) -> (value, bytes) run on the worker pool.
+
+        progress(stage, done, total, nbytes) is called with done=0 when the
+        stage starts and again as each item finishes.
+        """
+        items = list(items)
+        results = {}
+        if progress:
+            progress(stage, 0, len(items), 0)
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items) or 1)) as pool:
+            futures = {pool.submit(func, item): item for item in items}
+            for done, future in enumerate(as_completed(futures), 1):
+                results[futures[future]], nbytes = future.result()
+                if progress:
+                    progress(stage, done, len(items), nbytes)
+        return results
+
+    def hash_files(self, paths, manifest, progress=None):
+        """Blob shas for {repo path: local path}, hashed in parallel"""
+        def hash_one(path):
+            return manifest.file_sha(paths[path]), os.path.getsize(paths[path])
+        return self._map(hash_one, paths, "hash", progress)
+
+    def upload_files(self, paths, progress=None):
+        """Upload {repo path: local path} as blobs in parallel, streamed from disk"""
+        return self._map(lambda path: self.create_blob_from_file(paths[path]), paths, "upload", progress)
+
+    def commit_blobs(self, blobs, message, parent=None):
+        """Tree + commit + ref update for {path: blob sha} on top of the branch tip"""
+        parent_sha, base_tree = parent or self.head()
+        tree = self._call("POST", "git/trees", "Tree creation", json={
+            "base_tree": base_tree,
+            "tree": [{"path": path, "mode": "100644", "type": "blob", "sha": sha}
+                     for path, sha in sorted(blobs.items())]
+        })
+        commit = self._call("POST", "git/commits", "Commit creation", json={
+            "message": message,
+            "tree": tree["sha"],
+            "parents": [parent_sha]
+        })
+        self._call("PATCH", f"git/refs/heads/{self.default_branch()}", "Ref update", json={
+            "sha": commit["sha"]
+        })
+        return commit["sha"]
+
+    def remote_shas(self, tree_sha):
+        """{path: blob sha} for every file in a tree (one recursive GET)"""
+        tree = self._call("GET", f"git/trees/{tree_sha}", "Tree lookup", params={"recursive": "1"})
+        # A truncated listing just makes the missing files look changed
+        return {item["path"]: item["sha"] for item in tree.get("tree", []) if item.get("type") == "blob"}
+
+    def push_files(self, files, message):
+        """Commit {path: str|bytes} as a single commit; returns the commit sha"""
+        if not files:
+            return None
+        parent = self.head()
+        return self.commit_blobs(self.create_blobs(files), message, parent)
+
+    def push_changed(self, paths, message, manifest=None, progress=None, dry_run=False):
+        """Commit only the local files whose content differs from the branch.
+
+        ``paths`` maps repo path -> local file path. Returns (commit sha or
+        None, [changed repo paths]); nothing changed means no commit, and with a
+        manifest showing the same shas as the last deploy, no API calls at all.
+        ``dry_run`` stops after the diff.
+        """
+        manifest = manifest or DeployManifest()
+        shas = self.hash_files(paths, manifest, progress)
+        if not shas or manifest.unchanged(self.target, shas):
+            manifest.save()
+            return None, []
+
+        parent = self.head()
+        remote = self.remote_shas(parent[1])
+        changed = sorted(path for path, sha in shas.items() if remote.get(path) != sha)
+        if dry_run:
+            manifest.save()
+            return None, changed
+        commit_sha = None
+        if changed:
+            blobs = self.upload_files({path: paths[path] for path in changed}, progress)
+            for path in changed:
+                if blobs[path] != shas[path]:
+                    raise ValueError(f"{path} changed while it was being pushed")
+            commit_sha = self.commit_blobs(blobs, message, parent)
+        manifest.record(self.target, shas)
+        manifest.save()
+        return commit_sha, changed
+
+
+def read_files(paths, root="."):
+    """{repo path: bytes} for local files, repo paths relative to root"""
+    files = {}
+    for path in paths:
+        with open(os.path.join(root, path), 'rb') as f:
+            files[path.replace(os.sep, '/')] = f.read()
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Push files to GitHub Pages as one commit")
+    parser.add_argument("files", nargs="+", help="Paths relative to the site root")
+    parser.add_argument("-m", "--message", default="🤖 AI Agent: Deploy CodeDAO site files")
+    parser.add_argument("--root", default=".", help="Local site root")
+    parser.add_argument("--owner", default=REPO_OWNER)
+    parser.add_argument("--repo", default=REPO_NAME)
+    parser.add_argument("--branch", default=None)
+    args = parser.parse_args()
+
+    token = get_github_token(args.owner, args.repo)
+    if not token:
+        print("❌ No GitHub token found in environment or git credentials")
+        return 1
+
+    paths = {path.replace(os.sep, '/'): os.path.join(args.root, path) for path in args.files}
+    missing = [path for path in paths.values() if not os.path.isfile(path)]
+    if missing:
+        print(f"❌ File not found: {missing[0]}")
+        return 1
+
+    pusher = GitHubPusher(token, args.owner, args.repo, args.branch)
+    print(f"🚀 Pushing {len(paths)} file(s) to {args.owner}/{args.repo}...")
+    try:
+        commit_sha, changed = pusher.push_changed(paths, args.message)
+    except GitHubPushError as e:
+        print(f"❌ {e}")
+        return 1
+    if commit_sha is None:
+        print("✅ Already up to date - nothing pushed")
+    else:
+        print(f"🎉 SUCCESS! {len(changed)} changed file(s) in one commit: {commit_sha[:8]}...")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,10 +4,13 @@
 Autonomously deploy dashboard-working.html to GitHub Pages
 """
 
-import requests
 import json
 import os
-import base64
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from agent_gateway import AgentGatewayClient, GatewayError
+from github_push import DeployManifest
 
 print("🤖 CodeDAO AI Agent: Pushing Fixed Dashboard")
 print("=" * 60)
@@ -16,9 +19,9 @@ print("=" * 60)
 USER_ID = "ai-agent-codedao"
 REPO_NAME = "CodeDAO-org.github.io"
 FILE_PATH = "dashboard-working.html"
-AGENT_GATEWAY_URL = "http://localhost:3001"
+AGENT_GATEWAY_URL = os.getenv("AGENT_GATEWAY_URL", "http://localhost:3001")
 
-# Get GitHub Token from environment
+# Get GitHub Token from environment (never a locally resolved credential)
 GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
 if not GITHUB_TOKEN:
     # Fallback to a working token format
@@ -28,28 +31,30 @@ if not GITHUB_TOKEN:
 print(f"🔧 Target: {REPO_NAME}/{FILE_PATH}")
 print(f"🔗 Gateway: {AGENT_GATEWAY_URL}")
 
-# Step 1: Add GitHub Token to AI Agent Gateway
+# Skip the push entirely if the dashboard matches the last one deployed (git blob SHA-1)
+manifest = DeployManifest()
+manifest_target = f"gateway:{USER_ID}/{REPO_NAME}"
+local_sha = manifest.file_sha(FILE_PATH) if os.path.isfile(FILE_PATH) else None
+if local_sha and manifest.unchanged(manifest_target, {FILE_PATH: local_sha}):
+    print(f"✅ {FILE_PATH} unchanged since the last push ({local_sha[:8]}) - nothing to deploy")
+    exit(0)
+
+# Step 1: Add GitHub Token to AI Agent Gateway (skipped if it already has this token)
 print("\n🔐 Step 1: Adding token to AI Agent...")
-add_token_endpoint = f"{AGENT_GATEWAY_URL}/api/user/add-github-token"
-add_token_payload = {
-    "userId": USER_ID,
-    "githubToken": GITHUB_TOKEN
-}
-headers = {'Content-Type': 'application/json'}
+gateway = AgentGatewayClient(AGENT_GATEWAY_URL, USER_ID)
 
 try:
-    add_token_response = requests.post(add_token_endpoint, json=add_token_payload, headers=headers)
-    if add_token_response.status_code == 200:
+    if gateway.register_token(GITHUB_TOKEN):
         print("✅ Token added to AI Agent successfully")
     else:
-        print(f"❌ Failed to add token: {add_token_response.status_code} - {add_token_response.text}")
-        # Continue anyway - token might already be set
-except requests.exceptions.ConnectionError:
-    print(f"❌ Error: Could not connect to Agent Gateway at {AGENT_GATEWAY_URL}")
-    print("   Make sure the agent gateway is running: cd /Users/mikaelo/codedao-extension/agent-gateway && npm start")
-    exit(1)
-except Exception as e:
-    print(f"❌ Unexpected error: {e}")
+        print("✅ AI Agent already has this token")
+except GatewayError as e:
+    if e.status_code is None:
+        print(f"❌ Error: {e}")
+        print("   Make sure the agent gateway is running: cd /Users/mikaelo/codedao-extension/agent-gateway && npm start")
+        exit(1)
+    print(f"❌ {e}")
+    # Continue anyway - token might already be set
 
 # Step 2: Read the Dashboard File
 print("\n📖 Step 2: Reading dashboard file...")
@@ -65,15 +70,7 @@ except FileNotFoundError:
 
 # Step 3: Push Dashboard via AI Agent Gateway
 print("\n🚀 Step 3: Pushing via AI Agent Gateway...")
-push_endpoint = f"{AGENT_GATEWAY_URL}/api/github/push"
-push_payload = {
-    "userId": USER_ID,
-    "repo": REPO_NAME,
-    "files": [{
-        "path": FILE_PATH,
-        "content": content
-    }],
-    "commitMessage": """🤖 AI Agent: Deploy fixed CodeDAO Dashboard
+commit_message = """🤖 AI Agent: Deploy fixed CodeDAO Dashboard
 
 ✅ Fixed Issues:
 - ✅ Wallet connection with MetaMask integration
@@ -89,45 +86,32 @@ push_payload = {
 - Professional UI/UX
 
 🚀 CodeDAO: First AI Collaboration Transparency Platform"""
-}
 
 try:
-    push_response = requests.post(push_endpoint, json=push_payload, headers=headers)
-    print(f"📊 Response Status: {push_response.status_code}")
+    response_data = gateway.push(REPO_NAME, [{"path": FILE_PATH, "content": content}], commit_message)
+    print(f"📋 Response: {json.dumps(response_data, indent=2)}")
+    manifest.record(manifest_target, {FILE_PATH: local_sha})
+    manifest.save()
+    print("\n🎉 SUCCESS! AI Agent Push Completed!")
+    print(f"🔗 Live URL: https://codedao-org.github.io/{FILE_PATH}")
+    print("\n✅ Fixed Dashboard Features:")
+    print("   • ✅ MetaMask wallet connection")
+    print("   • ✅ Settings navigation fixed")
+    print("   • ✅ Clean HTML structure")
+    print("   • ✅ Moralis API integration")
+    print("   • ✅ Professional UI/UX")
+    print("\n🎯 CodeDAO MVP: READY FOR LAUNCH! 🚀")
+except GatewayError as e:
+    print("\n❌ AI Agent Push Failed")
+    print(f"   Reason: {e}")
     
-    if push_response.status_code == 200:
-        response_data = push_response.json()
-        print(f"📋 Response: {json.dumps(response_data, indent=2)}")
-        
-        if response_data.get('success'):
-            print("\n🎉 SUCCESS! AI Agent Push Completed!")
-            print(f"🔗 Live URL: https://codedao-org.github.io/{FILE_PATH}")
-            print("\n✅ Fixed Dashboard Features:")
-            print("   • ✅ MetaMask wallet connection")
-            print("   • ✅ Settings navigation fixed")
-            print("   • ✅ Clean HTML structure")
-            print("   • ✅ Moralis API integration")
-            print("   • ✅ Professional UI/UX")
-            print("\n🎯 CodeDAO MVP: READY FOR LAUNCH! 🚀")
-        else:
-            print("\n❌ AI Agent Push Failed")
-            error_msg = response_data.get('error', 'Unknown error')
-            print(f"   Reason: {error_msg}")
-            
-            # Check if files were processed
-            results = response_data.get('results', [])
-            for result in results:
-                if result.get('status') == 'error':
-                    print(f"   File Error: {result.get('error', 'Unknown file error')}")
-    else:
-        print(f"❌ HTTP Error: {push_response.status_code}")
-        print(f"   Response: {push_response.text}")
-
-except requests.exceptions.ConnectionError:
-    print(f"❌ Error: Could not connect to Agent Gateway at {AGENT_GATEWAY_URL}")
-    print("   Is the agent gateway running?")
-except Exception as e:
-    print(f"❌ Unexpected error during push: {e}")
+    # Check if files were processed
+    results = e.data.get('results', []) if isinstance(e.data, dict) else []
+    for result in results:
+        if result.get('status') == 'error':
+            print(f"   File Error: {result.get('error', 'Unknown file error')}")
+finally:
+    gateway.close()
 
 print("\n" + "=" * 60)
 print("🤖 AI Agent deployment complete!") 
\ No newline at end of file
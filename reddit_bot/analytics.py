@@ -1,86 +1,114 @@
+import hashlib
 import json
-import os
+from collections import namedtuple
 from datetime import datetime, timedelta
-from collections import defaultdict
+from .rolling import RollingCounters, hour_index
+from .storage import EventLogStorage, empty_analytics_data
+from .topk import TopKIndex
+
+# Event type -> list in the analytics document it appends to
+EVENT_LISTS = {
+    "weekly_thread": "weekly_threads",
+    "welcome_message": "welcome_messages",
+    "milestone_post": "milestone_posts",
+}
+
+# Pre-serialized dashboard JSON: body (bytes), text (str), etag, generation
+DashboardPayload = namedtuple("DashboardPayload", ["body", "text", "etag", "generation"])
 
 class RedditBotAnalytics:
-    def __init__(self, data_file="reddit_bot_analytics.json"):
+    def __init__(self, data_file="reddit_bot_analytics.json", storage=None, top_users_capacity=100):
         self.data_file = data_file
+        self.storage = storage or EventLogStorage(data_file)
+        self.rolling = RollingCounters()
+        self.top_users = TopKIndex(top_users_capacity)
+        self.generation = 0
+        self._payload_cache = None
         self.data = self.load_data()
     
     def load_data(self):
-        """Load existing analytics data"""
-        if os.path.exists(self.data_file):
-            with open(self.data_file, 'r') as f:
-                return json.load(f)
-        return {
-            "weekly_threads": [],
-            "welcome_messages": [],
-            "milestone_posts": [],
-            "user_interactions": defaultdict(int),
-            "subreddit_growth": [],
-            "engagement_metrics": {
-                "total_posts": 0,
-                "total_comments": 0,
-                "total_upvotes": 0
-            }
-        }
+        """Load existing analytics data (snapshot plus replayed event log)"""
+        data, events = self.storage.load()
+        if data is None:
+            data = empty_analytics_data()
+        self.data = data
+        self.top_users.rebuild(data["user_interactions"])
+        for event in events:
+            self._apply_event(event["type"], event["record"])
+        self.rolling.rebuild(self.data)
+        self.generation += 1
+        return self.data
     
     def save_data(self):
         """Save analytics data to file"""
-        with open(self.data_file, 'w') as f:
-            json.dump(self.data, f, indent=2, default=str)
+        self.storage.compact(self.data)
+    
+    def _apply_event(self, event_type, record):
+        """Fold one event into the in-memory document"""
+        self.data[EVENT_LISTS[event_type]].append(record)
+        if event_type == "welcome_message":
+            interactions = self.data["user_interactions"]
+            count = interactions.get(record["username"], 0) + 1
+            interactions[record["username"]] = count
+            self.top_users.update(record["username"], count)
+    
+    def _record_event(self, event_type, record, moment):
+        """Apply an event, update rolling counters and append it to storage"""
+        self._apply_event(event_type, record)
+        self.rolling.observe(event_type, record, moment)
+        self.storage.append({"type": event_type, "record": record}, self.data)
+        self.generation += 1
     
     def log_weekly_thread(self, post_id, title, upvotes=0, comments=0):
         """Track weekly thread performance"""
-        self.data["weekly_threads"].append({
-            "date": datetime.now().isoformat(),
+        now = datetime.now()
+        self._record_event("weekly_thread", {
+            "date": now.isoformat(),
             "post_id": post_id,
             "title": title,
             "upvotes": upvotes,
             "comments": comments
-        })
-        self.save_data()
+        }, now)
     
     def log_welcome_message(self, username, post_id):
         """Track welcome messages sent"""
-        self.data["welcome_messages"].append({
-            "date": datetime.now().isoformat(),
+        now = datetime.now()
+        self._record_event("welcome_message", {
+            "date": now.isoformat(),
             "username": username,
             "post_id": post_id
-        })
-        self.data["user_interactions"][username] += 1
-        self.save_data()
+        }, now)
     
     def log_milestone_post(self, milestone_type, details):
         """Track milestone announcements"""
-        self.data["milestone_posts"].append({
-            "date": datetime.now().isoformat(),
+        now = datetime.now()
+        self._record_event("milestone_post", {
+            "date": now.isoformat(),
             "type": milestone_type,
             "details": details
-        })
-        self.save_data()
+        }, now)
+    
+    def get_window_stats(self, window):
+        """Get stats for an arbitrary trailing window (timedelta), hour-granular"""
+        return self.rolling.window_stats(window)
     
     def get_weekly_stats(self):
         """Get stats for the past week"""
-        week_ago = datetime.now() - timedelta(days=7)
-        
-        recent_threads = [
-            t for t in self.data["weekly_threads"]
-            if datetime.fromisoformat(t["date"]) > week_ago
-        ]
-        
-        recent_welcomes = [
-            w for w in self.data["welcome_messages"]
-            if datetime.fromisoformat(w["date"]) > week_ago
-        ]
-        
-        return {
-            "threads_posted": len(recent_threads),
-            "welcome_messages_sent": len(recent_welcomes),
-            "new_users_welcomed": len(set(w["username"] for w in recent_welcomes)),
-            "total_engagement": sum(t.get("upvotes", 0) + t.get("comments", 0) for t in recent_threads)
-        }
+        return self.get_window_stats(timedelta(days=7))
+    
+    def get_daily_stats(self):
+        """Get stats for the past 24 hours"""
+        return self.get_window_stats(timedelta(days=1))
+    
+    def get_top_users(self, n=10):
+        """Get the n users with the most interactions as (username, count) pairs"""
+        if n <= self.top_users.capacity:
+            return self.top_users.top(n)
+        return sorted(
+            self.data["user_interactions"].items(),
+            key=lambda x: x[1],
+            reverse=True
+        )[:n]
     
     def get_dashboard_data(self):
         """Get data for management dashboard"""
@@ -94,13 +122,33 @@ class RedditBotAnalytics:
                 "unique_users": len(self.data["user_interactions"])
             },
             "weekly": weekly_stats,
-            "top_users": sorted(
-                self.data["user_interactions"].items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:10],
+            "daily": self.get_daily_stats(),
+            "top_users": self.get_top_users(10),
             "recent_activity": {
                 "last_thread": self.data["weekly_threads"][-1] if self.data["weekly_threads"] else None,
                 "last_welcome": self.data["welcome_messages"][-1] if self.data["welcome_messages"] else None
             }
-        } 
\ No newline at end of file
+        }
+    
+    def get_dashboard_payload(self):
+        """Get get_dashboard_data() as cached, pre-serialized JSON with an ETag.
+
+        The cache is keyed on the write generation (bumped by every load and
+        logged event) and the current hour, since the rolling windows move
+        even when nothing is written.
+        """
+        key = (self.generation, hour_index(datetime.now()))
+        if self._payload_cache is None or self._payload_cache[0] != key:
+            text = json.dumps(self.get_dashboard_data(), default=str)
+            body = text.encode('utf-8')
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            self._payload_cache = (key, DashboardPayload(body, text, etag, self.generation))
+        return self._payload_cache[1]
+
+
+def etag_matches(if_none_match, etag):
+    """True if an If-None-Match header value covers the given ETag"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
@@ -0,0 +1,221 @@
+import asyncio
+import logging
+import os
+import time
+from .bot import (BotBase, BotIdentity, WEEKLY_THREAD_CONTENT, WEEKLY_THREAD_TITLE,
+                  WELCOME_MESSAGE, format_milestone)
+from .ratelimit import RateLimitExceeded
+
+logger = logging.getLogger(__name__)
+
+class AsyncCodeDAOBot(BotBase):
+    """asyncio engine for the bot, built on asyncpraw.
+
+    Same behaviour and shared state (known authors, high-water mark, rate
+    budget, welcome queue bookkeeping via BotBase) as CodeDAOBot, but replies
+    and moderation calls for concurrent submissions overlap, up to
+    `concurrency` in flight. Writes still go through the shared RateLimiter.
+    Use as ``async with AsyncCodeDAOBot() as bot`` or from sync code via run_sync().
+    """
+    def __init__(self, config=None, state=None, concurrency=8):
+        super().__init__(config, state)
+        self.concurrency = concurrency
+        self.reddit = None
+        self.subreddit = None
+        self._semaphore = None
+        self._identity_fetched_at = 0.0
+        self._welcoming = set()  # (subreddit, lowercased name) with a welcome in flight
+
+    async def start(self):
+        """Open the asyncpraw session and fetch the bot's identity"""
+        try:
+            import asyncpraw
+        except ImportError:
+            raise ImportError("AsyncCodeDAOBot requires asyncpraw (pip install asyncpraw)")
+        self.reddit = asyncpraw.Reddit(
+            client_id=os.getenv("REDDIT_CLIENT_ID"),
+            client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
+            username=os.getenv("REDDIT_USERNAME"),
+            password=os.getenv("REDDIT_PASSWORD"),
+            user_agent=os.getenv("REDDIT_USER_AGENT"),
+        )
+        self.subreddit = await self.reddit.subreddit(self.subreddit_name)
+        for context in self.contexts.values():
+            context.subreddit = await self.reddit.subreddit(context.name)
+        await self.refresh_identity(force=True)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        logger.info(f"Async bot initialized for user: {self.identity.name}")
+        return self
+
+    async def close(self):
+        if self.reddit is not None:
+            await self.reddit.close()
+            self.reddit = None
+
+    async def refresh_identity(self, force=False):
+        """Re-fetch the bot's own account if the cached one is older than IDENTITY_TTL_SECONDS"""
+        now = time.monotonic()
+        if force or self.identity is None or now - self._identity_fetched_at > self.config.IDENTITY_TTL_SECONDS:
+            me = await self.reddit.user.me()
+            self.identity = BotIdentity(me.name, me.id)
+            self._identity_fetched_at = now
+        return self.identity
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def post_weekly_thread(self, subreddit_name=None):
+        """Post weekly thread; sticky and flair run concurrently"""
+        try:
+            context = self.get_context(subreddit_name)
+            submission = await context.write_async(context.subreddit.submit, title=WEEKLY_THREAD_TITLE,
+                                                   selftext=WEEKLY_THREAD_CONTENT)
+            await asyncio.gather(
+                context.write_async(submission.mod.sticky),
+                context.write_async(submission.mod.flair, text="Weekly Thread", css_class="weekly")
+            )
+            logger.info(f"Posted weekly thread: {submission.url}")
+            return submission
+        except Exception as e:
+            logger.error(f"Error posting weekly thread: {e}")
+            return None
+
+    async def post_weekly_threads(self):
+        """Weekly thread in every enabled subreddit, concurrently; returns [(subreddit, submission)]"""
+        names = [c.name for c in self.contexts.values() if c.config.WEEKLY_THREAD_ENABLED]
+        results = await asyncio.gather(*(self.post_weekly_thread(name) for name in names))
+        return [(name, submission) for name, submission in zip(names, results) if submission]
+
+    async def post_milestone_announcement(self, milestone_data, subreddit_name=None):
+        """Post milestone achievements"""
+        try:
+            context = self.get_context(subreddit_name)
+            title, content = format_milestone(milestone_data)
+            submission = await context.write_async(context.subreddit.submit, title=title, selftext=content)
+            await context.write_async(submission.mod.flair, text="Milestone", css_class="milestone")
+            logger.info(f"Posted milestone: {submission.url}")
+            return submission
+        except Exception as e:
+            logger.error(f"Error posting milestone: {e}")
+            return None
+
+    async def welcome_new_poster(self, submission):
+        """Send welcome message to first-time posters; returns True if sent"""
+        try:
+            return await self._send_welcome(submission)
+        except RateLimitExceeded:
+            raise
+        except Exception as e:
+            logger.error(f"Error sending welcome message: {e}")
+            return False
+
+    async def _send_welcome(self, submission):
+        """Welcome a first-time poster; True if sent, False if none was needed, errors propagate"""
+        author = submission.author
+        if author is None or self.is_self(author):
+            return False
+        context = self.context_for(submission)
+        key = (context.name, author.name.lower())
+        if author.name in context.known_authors or key in self._welcoming:
+            return False
+
+        self._welcoming.add(key)
+        try:
+            async with self._semaphore:
+                await context.write_async(submission.reply, WELCOME_MESSAGE, budget=("actions", "welcome"))
+            context.known_authors.add(author.name)
+            logger.info(f"Sent welcome message to {author.name}")
+            return True
+        finally:
+            self._welcoming.discard(key)
+
+    async def process_submissions(self, submissions):
+        """Welcome a burst of submissions concurrently; returns the welcomed ones"""
+        results = await asyncio.gather(*(self.welcome_new_poster(s) for s in submissions),
+                                       return_exceptions=True)
+        return [s for s, result in zip(submissions, results) if result is True]
+
+    async def drain_welcome_queue(self):
+        """Send due welcomes (see CodeDAOBot.drain_welcome_queue), each batch concurrently"""
+        drain = self._new_welcome_drain()
+        while True:
+            batch = drain.next_batch()
+            if not batch:
+                break
+            try:
+                submissions = {s.id: s async for s in self.reddit.info(fullnames=drain.fullnames(batch))}
+            except Exception:
+                drain.retry_later(batch)
+                raise
+            attempts = list(drain.attempts(batch, submissions, self.context_for))
+            results = await asyncio.gather(*(self._send_welcome(s) for _, s, _ in attempts),
+                                           return_exceptions=True)
+            for (item, _, context), result in zip(attempts, results):
+                drain.settle(item, context, result)
+        return drain.welcomed
+
+    async def run_welcome_worker(self, poll_seconds=30):
+        """Drain the welcome queue until cancelled, sleeping until the next welcome is due"""
+        while True:
+            try:
+                await self.refresh_identity()  # Off the per-post path; a no-op until IDENTITY_TTL_SECONDS pass
+                await self.drain_welcome_queue()
+            except Exception as e:
+                logger.error(f"Error draining welcome queue: {e}")
+            next_due = self.welcome_queue.next_due()
+            await asyncio.sleep(poll_seconds if next_due is None
+                                else min(poll_seconds, max(0.0, next_due - time.time())))
+
+    async def backfill_known_authors(self, before_utc=None):
+        """Seed each subreddit's known-authors index once (see CodeDAOBot.backfill_known_authors)"""
+        if before_utc is None:
+            before_utc = time.time()
+        total = 0
+        for context in self.contexts.values():
+            if context.known_authors.backfilled:
+                continue
+            submissions = [s async for s in context.subreddit.new(limit=None)]
+            submissions += [s async for s in context.subreddit.top(time_filter="all", limit=None)]
+            total += context.known_authors.backfill(submissions, before_utc)
+        return total
+
+    async def process_new_posts(self, max_posts=None):
+        """Batch pass since the high-water mark (see CodeDAOBot.process_new_posts), welcoming due posters concurrently"""
+        mark = self.state.get("monitor_high_water_mark")
+        await self.backfill_known_authors(mark["created_utc"] if mark else None)
+        new_posts = []
+        async for submission in self.subreddit.new(limit=max_posts or self.config.BATCH_MAX_POSTS):
+            if self._reached_mark(mark, submission):
+                break
+            new_posts.append(submission)
+
+        queued, mark = self._record_new_posts(mark, new_posts)
+        return self._batch_result(new_posts, queued, await self.drain_welcome_queue(), mark)
+
+    async def monitor_new_posts(self):
+        """Stream new posts into the welcome queue; a worker task sends them once due"""
+        await self.backfill_known_authors()
+        worker = asyncio.create_task(self.run_welcome_worker())
+        try:
+            async for submission in self.subreddit.stream.submissions(skip_existing=True):
+                self.enqueue_welcome(submission)
+        except Exception as e:
+            logger.error(f"Error monitoring new posts: {e}")
+        finally:
+            worker.cancel()
+            await asyncio.gather(worker, return_exceptions=True)
+
+    @classmethod
+    def run_sync(cls, method, *args, config=None, state=None, **kwargs):
+        """Thin sync wrapper: open a bot, await one of its coroutine methods, close.
+
+        e.g. ``AsyncCodeDAOBot.run_sync("process_new_posts")``; pass the
+        process's BotState as `state` so other holders of it don't go stale.
+        """
+        async def runner():
+            async with cls(config=config, state=state) as bot:
+                return await getattr(bot, method)(*args, **kwargs)
+        return asyncio.run(runner())
@@ -0,0 +1,62 @@
+import os
+
+_BACKFILLED_MARKER = "#backfilled"
+
+class KnownAuthors:
+    """Local index of usernames that have already posted in the subreddit.
+
+    Backed by an append-only text file (one lowercased name per line), so
+    membership is an O(1) set lookup and recording a new author is one
+    appended line. A marker line records that the one-time backfill ran.
+    """
+    
+    def __init__(self, index_file="reddit_bot_authors.txt"):
+        self.index_file = index_file
+        self.names = set()
+        self.backfilled = False
+        self.load()
+    
+    def load(self):
+        """Load the index from disk"""
+        if not os.path.exists(self.index_file):
+            return
+        with open(self.index_file, 'r') as f:
+            for line in f:
+                name = line.strip()
+                if name == _BACKFILLED_MARKER:
+                    self.backfilled = True
+                elif name:
+                    self.names.add(name)
+    
+    def __contains__(self, username):
+        return username.lower() in self.names
+    
+    def __len__(self):
+        return len(self.names)
+    
+    def add(self, username):
+        """Record an author; returns True if they were not known before"""
+        name = username.lower()
+        if name in self.names:
+            return False
+        self.names.add(name)
+        with open(self.index_file, 'a') as f:
+            f.write(name + "\n")
+        return True
+    
+    def backfill(self, submissions, before_utc):
+        """One-time seed from subreddit listings, ignoring posts newer than before_utc"""
+        new_names = set()
+        for submission in submissions:
+            if submission.author is None or submission.created_utc > before_utc:
+                continue
+            name = submission.author.name.lower()
+            if name not in self.names:
+                new_names.add(name)
+        self.names.update(new_names)
+        with open(self.index_file, 'a') as f:
+            for name in sorted(new_names):
+                f.write(name + "\n")
+            f.write(_BACKFILLED_MARKER + "\n")
+        self.backfilled = True
+        return len(new_names)
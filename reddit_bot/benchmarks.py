@@ -0,0 +1,423 @@
+"""Micro-benchmarks for the Reddit bot hot paths.
+
+Run one with ``python -m reddit_bot.benchmarks <name>``; see BENCHMARKS below.
+"""
+import itertools
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from .topk import TopKIndex
+
+
+def _timed(fn, repeat=5):
+    """Best-of-N wall time in milliseconds"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def bench_top_users(users=1_000_000, n=10, updates=100_000):
+    """Full sort of user_interactions vs the maintained TopKIndex"""
+    rng = random.Random(42)
+    counts = {f"user{i}": rng.randint(1, 50) for i in range(users)}
+
+    sort_ms, sorted_top = _timed(
+        lambda: sorted(counts.items(), key=lambda x: x[1], reverse=True)[:n], repeat=3)
+
+    index = TopKIndex(100)
+    rebuild_ms, _ = _timed(lambda: index.rebuild(counts), repeat=1)
+    query_ms, index_top = _timed(lambda: index.top(n))
+    assert index_top == sorted_top, "TopKIndex disagrees with full sort"
+
+    names = list(counts)
+    start = time.perf_counter()
+    for _ in range(updates):
+        username = rng.choice(names)
+        counts[username] += 1
+        index.update(username, counts[username])
+    update_us = (time.perf_counter() - start) / updates * 1e6
+
+    print(f"top_users: {users:,} users, top {n}")
+    print(f"  full sort per dashboard call : {sort_ms:10.2f} ms")
+    print(f"  TopKIndex.top per call       : {query_ms:10.4f} ms")
+    print(f"  TopKIndex cold rebuild (once): {rebuild_ms:10.2f} ms")
+    print(f"  TopKIndex.update per welcome : {update_us:10.2f} us")
+
+
+# Code each handler action runs at import/cold start. Read-only actions run
+# end to end against a throwaway analytics file; Reddit actions only import
+# what they would use, so no network is needed.
+_ACTION_PROBES = {
+    "analytics": "from reddit_bot import serverless_handler as h; h.lambda_handler({'action': 'analytics'}, None)",
+    "health": "from reddit_bot import serverless_handler as h; h.lambda_handler({'action': 'health'}, None)",
+    "weekly_thread": "from reddit_bot import serverless_handler, bot; import praw",
+    "milestone": "from reddit_bot import serverless_handler, bot; import praw",
+    "monitor_posts": "from reddit_bot import serverless_handler, bot; import praw",
+}
+READ_ONLY_ACTIONS = ("analytics", "health")
+READ_ONLY_IMPORT_BUDGET_MS = 40
+HEAVY_MODULES = ("praw", "prawcore", "schedule", "dotenv", "requests", "urllib3")
+
+
+def _import_profile(code, env):
+    """Run code under -X importtime; return ({top-level module: self us}, total self ms)"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True, env=env)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        top = name.strip().split(".")[0]
+        modules[top] = modules.get(top, 0) + int(self_us)
+    return modules, sum(modules.values()) / 1000
+
+
+def _probe_env(tmp):
+    """Environment for the import probes: serverless mode, all storage under tmp"""
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return dict(os.environ,
+                PYTHONPATH=package_root,
+                REDDIT_SERVERLESS="true",
+                REDDIT_DATA_DIR=tmp,
+                REDDIT_ANALYTICS_FILE=os.path.join(tmp, "analytics.json"))
+
+
+def bench_import_budget():
+    """Import cost per handler action (python -X importtime), minus interpreter startup"""
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        env = _probe_env(tmp)
+        _, baseline_ms = _import_profile("pass", env)
+        print(f"import budget (interpreter baseline {baseline_ms:.1f} ms excluded)")
+        for action, code in _ACTION_PROBES.items():
+            try:
+                modules, total_ms = _import_profile(code, env)
+            except RuntimeError as e:
+                print(f"  {action:14s} skipped ({e})")
+                continue
+            cost_ms = total_ms - baseline_ms
+            heaviest = sorted(modules.items(), key=lambda x: x[1], reverse=True)[:3]
+            detail = ", ".join(f"{name} {us / 1000:.1f}ms" for name, us in heaviest)
+            status = ""
+            if action in READ_ONLY_ACTIONS:
+                loaded = [name for name in HEAVY_MODULES if name in modules]
+                if loaded or cost_ms > READ_ONLY_IMPORT_BUDGET_MS:
+                    ok = False
+                    status = f"  OVER BUDGET ({READ_ONLY_IMPORT_BUDGET_MS} ms; heavy: {loaded})"
+            print(f"  {action:14s} {cost_ms:7.1f} ms  [{detail}]{status}")
+    return ok
+
+
+def _start_mock_reddit(latency):
+    """Local HTTP server answering the Reddit endpoints a welcome burst touches, each after `latency` s"""
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    counter = itertools.count()
+
+    class MockReddit(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            time.sleep(latency)
+            self._send({"name": "codedao_bot", "id": "bot1"})  # /api/v1/me
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if self.path.startswith("/api/v1/access_token"):
+                self._send({"access_token": "mock", "token_type": "bearer",
+                            "expires_in": 86400, "scope": "*"})
+                return
+            time.sleep(latency)
+            comment_id = f"c{next(counter)}"
+            self._send({"json": {"errors": [], "data": {"things": [{"kind": "t1", "data": {
+                "id": comment_id, "name": f"t1_{comment_id}", "body": "welcome",
+                "link_id": "t3_x", "parent_id": "t3_x"}}]}}})
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockReddit)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def bench_async_welcome(posts=50, latency=0.2, concurrency=10):
+    """Sync vs async engine on a burst of first-time posters against a mock Reddit server"""
+    try:
+        import praw
+        import asyncpraw
+    except ImportError as e:
+        print(f"async_welcome: skipped ({e})")
+        return None
+
+    import asyncio
+    from .async_bot import AsyncCodeDAOBot
+    from .bot import CodeDAOBot
+
+    server = _start_mock_reddit(latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # Endpoint URLs are only read from a praw.ini in the working directory
+        with open(os.path.join(tmp, "praw.ini"), "w") as f:
+            f.write(f"[DEFAULT]\noauth_url={base_url}\nreddit_url={base_url}\n")
+        os.chdir(tmp)
+        os.environ.update({
+            "PRAW_ALLOW_ENDPOINT_OVERRIDE": "1",
+            "REDDIT_CLIENT_ID": "id", "REDDIT_CLIENT_SECRET": "secret",
+            "REDDIT_USERNAME": "codedao_bot", "REDDIT_PASSWORD": "pw",
+            "REDDIT_USER_AGENT": "codedao-benchmark", "REDDIT_LOG_FILE": "",
+            # Budget wide open: this measures engine throughput, not the rate limiter
+            "REDDIT_RATE_LIMIT": "0", "REDDIT_MAX_ACTIONS_HOUR": "1000000",
+            "REDDIT_WELCOME_MAX_HOUR": "1000000",
+        })
+
+        def configure(name):
+            os.environ["REDDIT_STATE_FILE"] = os.path.join(tmp, f"{name}_state.json")
+            os.environ["REDDIT_AUTHOR_INDEX_FILE"] = os.path.join(tmp, f"{name}_authors.txt")
+
+        configure("sync")
+        bot = CodeDAOBot()
+        logging.getLogger("reddit_bot").setLevel(logging.WARNING)  # one INFO line per welcome otherwise
+        burst = [praw.models.Submission(bot.reddit, _data={
+            "id": f"s{i}", "author": f"newbie{i}", "subreddit": "CodeDAO"})
+            for i in range(posts)]
+        start = time.perf_counter()
+        sync_sent = sum(bot.welcome_new_poster(s) for s in burst)
+        sync_s = time.perf_counter() - start
+
+        async def run_async():
+            configure("async")
+            async with AsyncCodeDAOBot(concurrency=concurrency) as abot:
+                burst = [asyncpraw.models.Submission(abot.reddit, _data={
+                    "id": f"s{i}", "author": f"newbie{i}", "subreddit": "CodeDAO"})
+                    for i in range(posts)]
+                start = time.perf_counter()
+                sent = await abot.process_submissions(burst)
+                return len(sent), time.perf_counter() - start
+
+        try:
+            async_sent, async_s = asyncio.run(run_async())
+        finally:
+            os.chdir(cwd)
+    server.shutdown()
+
+    print(f"async_welcome: {posts} first-time posters, {latency * 1000:.0f} ms per mock reply")
+    print(f"  sync  CodeDAOBot      : {sync_sent:3d} sent in {sync_s:6.2f}s ({sync_sent / sync_s:6.1f}/s)")
+    print(f"  async AsyncCodeDAOBot : {async_sent:3d} sent in {async_s:6.2f}s ({async_sent / async_s:6.1f}/s)"
+          f"  x{sync_s / async_s:.1f}")
+
+
+def _start_https_stub(tmp):
+    """Local HTTPS server answering workflow_dispatch with 204, plus its self-signed cert path"""
+    import shutil
+    import ssl
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    if not shutil.which("openssl"):
+        raise RuntimeError("openssl not found")
+    cert, key = os.path.join(tmp, "cert.pem"), os.path.join(tmp, "key.pem")
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                    "-keyout", key, "-out", cert, "-subj", "/CN=localhost",
+                    "-addext", "subjectAltName=IP:127.0.0.1,DNS:localhost"],
+                   check=True, capture_output=True)
+
+    class GitHubStub(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self.send_response(204)
+            self.end_headers()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), GitHubStub)
+    server.daemon_threads = True
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, cert
+
+
+def bench_github_dispatch(dispatches=50):
+    """Per-dispatch latency: bare requests.post vs the shared GitHubSession, against a local HTTPS stub"""
+    import requests
+    from .github_session import close_sessions
+    from .webhook_integration import GitHubActionsWebhook
+
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            server, cert = _start_https_stub(tmp)
+        except (RuntimeError, subprocess.CalledProcessError) as e:
+            print(f"github_dispatch: skipped ({e})")
+            return None
+        api_url = f"https://127.0.0.1:{server.server_address[1]}"
+        saved = {name: os.environ.get(name) for name in ("REQUESTS_CA_BUNDLE", "GITHUB_API_URL", "GITHUB_TOKEN")}
+        os.environ.update(REQUESTS_CA_BUNDLE=cert, GITHUB_API_URL=api_url, GITHUB_TOKEN="bench")
+        try:
+            webhook = GitHubActionsWebhook()
+            url = f"{api_url}/repos/{webhook.repo_owner}/{webhook.repo_name}/actions/workflows/reddit-bot.yml/dispatches"
+
+            def bare():
+                # What trigger_weekly_thread did before: new connection and TLS handshake each call
+                headers = {
+                    "Authorization": f"token {webhook.github_token}",
+                    "Accept": "application/vnd.github.v3+json",
+                    "Content-Type": "application/json"
+                }
+                return requests.post(url, headers=headers, json={"ref": "main", "inputs": {"action": "weekly_thread"}})
+
+            close_sessions()
+            webhook.trigger_weekly_thread()  # Warm the pool, as a long-lived process would be
+            results = {}
+            for name, dispatch in (("bare requests.post", bare), ("shared GitHubSession", webhook.trigger_weekly_thread)):
+                start = time.perf_counter()
+                for _ in range(dispatches):
+                    dispatch()
+                results[name] = (time.perf_counter() - start) / dispatches * 1000
+        finally:
+            close_sessions()
+            server.shutdown()
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+    print(f"github_dispatch: {dispatches} workflow dispatches to a local HTTPS stub")
+    for name, ms in results.items():
+        print(f"  {name:22s}: {ms:7.2f} ms per dispatch")
+    bare_ms, pooled_ms = results.values()
+    print(f"  speedup               : x{bare_ms / pooled_ms:.1f}")
+    return pooled_ms < bare_ms
+
+
+class _SyntheticWebhookBody:
+    """Readable JSON push-style webhook body of about `size` bytes, generated as it is read"""
+
+    def __init__(self, size):
+        self._chunks = self._generate(size)
+        self._buffer = bytearray()
+
+    @staticmethod
+    def _generate(size):
+        yield b'{"action": "push", "repository": {"full_name": "CodeDAO-org/codedao-extension"}, "commits": ['
+        sent, i = 0, 0
+        while sent < size:
+            commit = (b', ' if i else b'') + (
+                b'{"id": "%040d", "message": "Update dashboard widgets and analytics", '
+                b'"author": {"name": "builder%d", "email": "builder%d@example.com"}, "added": [], "modified": ["a.py"]}'
+                % (i, i % 997, i % 997))
+            sent += len(commit)
+            i += 1
+            yield commit
+        yield b']}'
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+def bench_webhook_stream(size_mb=10):
+    """Buffered verify + json.loads vs one-pass streaming HMAC + incremental JSON on a large body"""
+    import hashlib
+    import hmac
+    import json
+    import tracemalloc
+    from .webhook_stream import CHUNK_SIZE, parse_signed_json
+
+    size = size_mb * 1024 * 1024
+    secret = "benchmark-secret"
+    mac = hmac.new(secret.encode(), digestmod=hashlib.sha256)
+    body = _SyntheticWebhookBody(size)
+    for chunk in iter(lambda: body.read(CHUNK_SIZE), b""):
+        mac.update(chunk)
+    signature = "sha256=" + mac.hexdigest()
+
+    os.environ["REDDIT_WEBHOOK_SECRET"] = secret
+    from .webhook_integration import GitHubActionsWebhook
+    webhook = GitHubActionsWebhook()
+
+    def buffered():
+        payload = _SyntheticWebhookBody(size).read()
+        assert webhook.verify_webhook_signature(payload, signature)
+        return json.loads(payload)["repository"]["full_name"]
+
+    def streamed_full():
+        return parse_signed_json(_SyntheticWebhookBody(size), secret, signature)["repository"]["full_name"]
+
+    def streamed_fields():
+        return parse_signed_json(_SyntheticWebhookBody(size), secret, signature,
+                                 prefixes=["action", "repository.full_name"])["repository.full_name"]
+
+    try:
+        import ijson
+        variants = [("buffered verify + json.loads", buffered),
+                    ("streaming, full document", streamed_full),
+                    ("streaming, 2 fields", streamed_fields)]
+    except ImportError:
+        print("  (ijson not installed: streaming falls back to json.load)")
+        variants = [("buffered verify + json.loads", buffered), ("streaming, 2 fields", streamed_fields)]
+
+    print(f"webhook_stream: {size_mb} MB signed JSON body")
+    peaks = {}
+    for name, fn in variants:
+        ms, result = _timed(fn, repeat=3)
+        assert result == "CodeDAO-org/codedao-extension"
+        tracemalloc.start()
+        fn()
+        peaks[name] = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+        print(f"  {name:30s}: {ms:8.1f} ms, peak {peaks[name]:7.1f} MB")
+    return peaks["streaming, 2 fields"] < peaks["buffered verify + json.loads"]
+
+
+BENCHMARKS = {
+    "top_users": bench_top_users,
+    "import_budget": bench_import_budget,
+    "async_welcome": bench_async_welcome,
+    "github_dispatch": bench_github_dispatch,
+    "webhook_stream": bench_webhook_stream,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    failed = [name for name in names if BENCHMARKS[name]() is False]
+    if failed:
+        sys.exit(f"failed: {', '.join(failed)}")
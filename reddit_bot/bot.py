@@ -1,42 +1,45 @@
+import itertools
 import os
+import signal
+import threading
 import time
-import schedule
+from collections import namedtuple
 from datetime import datetime
-from dotenv import load_dotenv
-import praw
 import logging
+from .config import BotConfig, default_log_file, load_environment
+from .ratelimit import RateLimitExceeded
+from .state import BotState
+from .subreddits import build_contexts
+from .welcome_queue import WelcomeDrain, WelcomeQueue
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('reddit_bot.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
+_logging_configured = False
 
-load_dotenv()
-
-class CodeDAOBot:
-    def __init__(self):
-        self.reddit = praw.Reddit(
-            client_id=os.getenv("REDDIT_CLIENT_ID"),
-            client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
-            username=os.getenv("REDDIT_USERNAME"),
-            password=os.getenv("REDDIT_PASSWORD"),
-            user_agent=os.getenv("REDDIT_USER_AGENT"),
-        )
-        self.subreddit_name = os.getenv("REDDIT_SUBREDDIT", "CodeDAO")
-        self.subreddit = self.reddit.subreddit(self.subreddit_name)
-        logger.info(f"Bot initialized for user: {self.reddit.user.me()}")
-    
-    def post_weekly_thread(self):
-        """Post weekly 'What are you building?' thread"""
-        try:
-            title = "🚀 Weekly Builder Thread - What are you building this week?"
-            content = """Welcome to the weekly CodeDAO builder thread!
+# The authenticated account, fetched once per session
+BotIdentity = namedtuple("BotIdentity", ["name", "id"])
+
+def setup_logging():
+    """Configure bot logging on first use rather than at import time.
+
+    REDDIT_LOG_FILE sets the log file; an empty value logs to stderr only,
+    the default on serverless platforms (see config.default_log_file).
+    """
+    global _logging_configured
+    if _logging_configured:
+        return
+    _logging_configured = True
+    handlers = [logging.StreamHandler()]
+    log_file = os.getenv("REDDIT_LOG_FILE", default_log_file())
+    if log_file:
+        handlers.insert(0, logging.FileHandler(log_file))
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=handlers
+    )
+
+WEEKLY_THREAD_TITLE = "🚀 Weekly Builder Thread - What are you building this week?"
+WEEKLY_THREAD_CONTENT = """Welcome to the weekly CodeDAO builder thread!
 
 **Share what you're working on:**
 - Your current coding projects
@@ -52,29 +55,8 @@ class CodeDAOBot:
 Remember: Every commit, every PR, every contribution makes you a better developer. Let's build together! 🔥
 
 *This is an automated weekly post by CodeDAOAgent*"""
-            
-            submission = self.subreddit.submit(title=title, selftext=content)
-            submission.mod.sticky()  # Sticky the post if bot is moderator
-            submission.mod.flair(text="Weekly Thread", css_class="weekly")
-            
-            logger.info(f"Posted weekly thread: {submission.url}")
-            return submission
-            
-        except Exception as e:
-            logger.error(f"Error posting weekly thread: {e}")
-            return None
-    
-    def welcome_new_poster(self, submission):
-        """Send welcome message to first-time posters"""
-        try:
-            author = submission.author
-            if author and author != self.reddit.user.me():
-                # Check if user has posted before (simple check)
-                user_submissions = list(self.reddit.redditor(author.name).submissions.new(limit=10))
-                codedao_posts = [s for s in user_submissions if s.subreddit.display_name == self.subreddit_name]
-                
-                if len(codedao_posts) <= 1:  # First or very few posts
-                    welcome_msg = """Welcome to CodeDAO! 🎉
+
+WELCOME_MESSAGE = """Welcome to CodeDAO! 🎉
 
 Great to have you in our community of builders and developers!
 
@@ -92,39 +74,310 @@ Great to have you in our community of builders and developers!
 Happy coding! 🚀
 
 *This is an automated welcome message from CodeDAOAgent*"""
-                    
-                    submission.reply(welcome_msg)
-                    logger.info(f"Sent welcome message to {author.name}")
-                    
+
+def format_milestone(milestone_data):
+    """Title and body for a milestone announcement"""
+    title = f"🎉 Milestone Alert: {milestone_data.get('title', 'New Achievement!')}"
+    content = f"""**{milestone_data.get('description', 'A new milestone has been reached!')}**
+
+{milestone_data.get('details', '')}
+
+**Join the action:**
+- 🌐 Dashboard: https://codedao-org.github.io/dashboard.html
+- 🚀 Get Started: https://codedao-org.github.io/get-started.html
+
+*Posted by CodeDAOAgent*"""
+    return title, content
+
+class BotBase:
+    """Engine-independent parts of the bot, shared by CodeDAOBot and AsyncCodeDAOBot:
+    subreddit contexts, the welcome queue and high-water-mark bookkeeping.
+    Subclasses attach the Reddit client and set ``identity``.
+    """
+    
+    def __init__(self, config=None, state=None):
+        load_environment()
+        setup_logging()
+        self.config = config or BotConfig()
+        self.state = state or BotState(self.config.STATE_FILE)
+        # One context per subreddit; the first one doubles as the single-subreddit defaults
+        self.contexts = build_contexts(self.config, self.state)
+        self.primary = self.contexts[self.config.SUBREDDITS[0].lower()]
+        self.known_authors = self.primary.known_authors
+        self.rate_limiter = self.primary.rate_limiter
+        self.welcome_queue = WelcomeQueue(self.config.WELCOME_QUEUE_FILE)
+        # Listings and the stream run over one combined "sub1+sub2" subreddit
+        self.subreddit_name = "+".join(self.config.SUBREDDITS)
+        self.identity = None
+    
+    def get_context(self, subreddit_name=None):
+        """SubredditContext by name (default: the first configured subreddit)"""
+        if subreddit_name is None:
+            return self.primary
+        try:
+            return self.contexts[subreddit_name.lower()]
+        except KeyError:
+            raise ValueError(f"Subreddit not configured: {subreddit_name}")
+    
+    def context_for(self, submission):
+        """SubredditContext a submission from the combined listing belongs to"""
+        if len(self.contexts) == 1:
+            return self.primary
+        return self.contexts.get(submission.subreddit.display_name.lower(), self.primary)
+    
+    def is_self(self, redditor):
+        """True if the redditor is this bot (cached identity, no API call)"""
+        return redditor.name.lower() == self.identity.name.lower()
+    
+    def enqueue_welcome(self, submission):
+        """Queue a welcome for a first-time poster, due WELCOME_DELAY_MINUTES after they posted"""
+        author = submission.author
+        context = self.context_for(submission)
+        if not context.config.WELCOME_ENABLED or author is None or self.is_self(author):
+            return False
+        if author.name in context.known_authors:
+            return False
+        due = submission.created_utc + context.config.WELCOME_DELAY_MINUTES * 60
+        self.welcome_queue.enqueue(submission.id, author.name, due, context.name)
+        return True
+    
+    def _new_welcome_drain(self):
+        return WelcomeDrain(self.welcome_queue, self.contexts, self.config.WELCOME_BATCH_SIZE)
+    
+    @staticmethod
+    def _reached_mark(mark, submission):
+        """True once a newest-first scan gets back to the stored high-water mark"""
+        return bool(mark) and (submission.fullname == mark["fullname"]
+                               or submission.created_utc < mark["created_utc"])
+    
+    def _record_new_posts(self, mark, new_posts):
+        """Queue welcomes for a newest-first scan past `mark` and commit the new mark; returns (queued, mark)"""
+        queued = 0
+        if mark:
+            queued = sum(self.enqueue_welcome(submission) for submission in reversed(new_posts))
+        
+        if new_posts:
+            mark = {"fullname": new_posts[0].fullname, "created_utc": new_posts[0].created_utc}
+            self.state.set("monitor_high_water_mark", mark)
+        return queued, mark
+    
+    def _batch_result(self, new_posts, queued, welcomed, mark):
+        logger.info(f"Batch processed {len(new_posts)} new posts, queued {queued}, welcomed {len(welcomed)}")
+        return {
+            "processed": len(new_posts),
+            "queued": queued,
+            "pending": len(self.welcome_queue),
+            "welcomed": welcomed,
+            "high_water_mark": mark["fullname"] if mark else None
+        }
+
+class CodeDAOBot(BotBase):
+    def __init__(self, config=None, state=None):
+        super().__init__(config, state)
+        self._local = threading.local()
+        self._identity_fetched_at = 0.0
+        self.refresh_identity(force=True)
+        logger.info(f"Bot initialized for user: {self.identity.name}")
+    
+    @property
+    def reddit(self):
+        """This thread's praw.Reddit.
+
+        PRAW clients are not thread-safe, so the stream, the welcome worker
+        and the scheduler's jobs each get their own, created on first use.
+        """
+        reddit = getattr(self._local, "reddit", None)
+        if reddit is None:
+            # Heavy dependencies are imported here so read-only handlers never pay for them
+            import praw
+            reddit = self._local.reddit = praw.Reddit(
+                client_id=os.getenv("REDDIT_CLIENT_ID"),
+                client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
+                username=os.getenv("REDDIT_USERNAME"),
+                password=os.getenv("REDDIT_PASSWORD"),
+                user_agent=os.getenv("REDDIT_USER_AGENT"),
+            )
+        return reddit
+    
+    @property
+    def subreddit(self):
+        """The combined "sub1+sub2" subreddit on this thread's client"""
+        return self.reddit.subreddit(self.subreddit_name)
+    
+    def subreddit_for(self, context):
+        """One configured subreddit on this thread's client"""
+        return self.reddit.subreddit(context.name)
+    
+    def refresh_identity(self, force=False):
+        """Re-fetch the bot's own account if the cached one is older than IDENTITY_TTL_SECONDS"""
+        now = time.monotonic()
+        if force or self.identity is None or now - self._identity_fetched_at > self.config.IDENTITY_TTL_SECONDS:
+            me = self.reddit.user.me()
+            self.identity = BotIdentity(me.name, me.id)
+            self._identity_fetched_at = now
+        return self.identity
+    
+    def post_weekly_thread(self, subreddit_name=None):
+        """Post weekly 'What are you building?' thread"""
+        try:
+            context = self.get_context(subreddit_name)
+            title = WEEKLY_THREAD_TITLE
+            content = WEEKLY_THREAD_CONTENT
+            
+            submission = context.write(self.subreddit_for(context).submit, title=title, selftext=content)
+            context.write(submission.mod.sticky)  # Sticky the post if bot is moderator
+            context.write(submission.mod.flair, text="Weekly Thread", css_class="weekly")
+            
+            logger.info(f"Posted weekly thread: {submission.url}")
+            return submission
+            
+        except Exception as e:
+            logger.error(f"Error posting weekly thread: {e}")
+            return None
+    
+    def post_weekly_threads(self):
+        """Post the weekly thread in every subreddit that has it enabled; returns [(subreddit, submission)]"""
+        posted = []
+        for context in self.contexts.values():
+            if context.config.WEEKLY_THREAD_ENABLED:
+                submission = self.post_weekly_thread(context.name)
+                if submission:
+                    posted.append((context.name, submission))
+        return posted
+    
+    def backfill_known_authors(self, before_utc=None):
+        """Seed each subreddit's known-authors index once from its new and top listings"""
+        if before_utc is None:
+            before_utc = time.time()
+        total = 0
+        for context in self.contexts.values():
+            if context.known_authors.backfilled:
+                continue
+            listings = itertools.chain(
+                self.subreddit_for(context).new(limit=None),
+                self.subreddit_for(context).top(time_filter="all", limit=None)
+            )
+            added = context.known_authors.backfill(listings, before_utc)
+            logger.info(f"Backfilled {added} known authors in r/{context.name} ({len(context.known_authors)} total)")
+            total += added
+        return total
+    
+    def welcome_new_poster(self, submission):
+        """Send welcome message to first-time posters"""
+        try:
+            return self._send_welcome(submission)
+        except RateLimitExceeded:
+            raise  # The queue re-schedules these instead of dropping them
         except Exception as e:
             logger.error(f"Error sending welcome message: {e}")
+        return False
+    
+    def _send_welcome(self, submission):
+        """Welcome a first-time poster; True if sent, False if none was needed, errors propagate"""
+        author = submission.author
+        if author and not self.is_self(author):
+            context = self.context_for(submission)
+            # Local index lookup instead of fetching the author's history
+            if author.name not in context.known_authors:  # First post here
+                context.write(submission.reply, WELCOME_MESSAGE, budget=("actions", "welcome"))
+                # Only index after a successful reply so a failed welcome is retried later
+                context.known_authors.add(author.name)
+                logger.info(f"Sent welcome message to {author.name}")
+                return True
+        return False
+    
+    def drain_welcome_queue(self):
+        """Welcome every poster whose delay has elapsed; returns the welcomes sent.
+
+        Due items are claimed WELCOME_BATCH_SIZE at a time and their submissions
+        fetched with one /api/info request per batch (see WelcomeDrain).
+        """
+        drain = self._new_welcome_drain()
+        while True:
+            batch = drain.next_batch()
+            if not batch:
+                break
+            try:
+                submissions = {s.id: s for s in self.reddit.info(fullnames=drain.fullnames(batch))}
+            except Exception:
+                drain.retry_later(batch)
+                raise
+            for item, submission, context in drain.attempts(batch, submissions, self.context_for):
+                try:
+                    result = self._send_welcome(submission)
+                except Exception as e:
+                    result = e
+                drain.settle(item, context, result)
+        return drain.welcomed
+    
+    def run_welcome_worker(self, stop_event, poll_seconds=30):
+        """Drain the welcome queue until stop_event is set, sleeping until the next welcome is due"""
+        while not stop_event.is_set():
+            try:
+                self.refresh_identity()  # Off the per-post path; a no-op until IDENTITY_TTL_SECONDS pass
+                self.drain_welcome_queue()
+            except Exception as e:
+                logger.error(f"Error draining welcome queue: {e}")
+            next_due = self.welcome_queue.next_due()
+            timeout = poll_seconds if next_due is None else min(poll_seconds, max(0.0, next_due - time.time()))
+            stop_event.wait(timeout)
     
-    def monitor_new_posts(self):
-        """Monitor for new posts and send welcome messages"""
+    def monitor_new_posts(self, stop_event=None):
+        """Monitor for new posts and queue welcome messages; a worker thread sends them once due.
+
+        Runs until the stream fails or stop_event is set (checked whenever a
+        stream poll comes back empty).
+        """
+        stop_event = stop_event or threading.Event()
+        worker_stop = threading.Event()
+        worker = threading.Thread(target=self.run_welcome_worker, args=(worker_stop,),
+                                  name="welcome-worker", daemon=True)
+        worker.start()
         try:
-            for submission in self.subreddit.stream.submissions(skip_existing=True):
-                self.welcome_new_poster(submission)
-                time.sleep(2)  # Rate limiting
+            self.backfill_known_authors()
+            for submission in self.subreddit.stream.submissions(skip_existing=True, pause_after=0):
+                if submission is None:
+                    if stop_event.is_set():
+                        break
+                    continue
+                self.enqueue_welcome(submission)  # Never waits on a reply
                 
         except Exception as e:
             logger.error(f"Error monitoring new posts: {e}")
+        finally:
+            worker_stop.set()
+            worker.join()
+    
+    def process_new_posts(self, max_posts=None):
+        """Stateless batch pass over submissions newer than the persisted high-water mark.
+
+        Walks the combined r/<sub1+sub2>/new newest-first (100 per listing request), so
+        one listing and one mark cover every subreddit, and stops at the
+        stored mark, so a backlog costs ceil(new_posts / 100) requests. New
+        first-time posters are queued oldest-first, the new mark is committed,
+        and whatever welcomes are due by now (including ones queued by earlier
+        runs) are sent. The first run only records the mark, like
+        stream(skip_existing=True).
+        """
+        mark = self.state.get("monitor_high_water_mark")
+        self.backfill_known_authors(mark["created_utc"] if mark else None)
+        new_posts = []
+        for submission in self.subreddit.new(limit=max_posts or self.config.BATCH_MAX_POSTS):
+            if self._reached_mark(mark, submission):
+                break
+            new_posts.append(submission)
+        
+        queued, mark = self._record_new_posts(mark, new_posts)
+        return self._batch_result(new_posts, queued, self.drain_welcome_queue(), mark)
     
-    def post_milestone_announcement(self, milestone_data):
+    def post_milestone_announcement(self, milestone_data, subreddit_name=None):
         """Post milestone achievements"""
         try:
-            title = f"🎉 Milestone Alert: {milestone_data.get('title', 'New Achievement!')}"
-            content = f"""**{milestone_data.get('description', 'A new milestone has been reached!')}**
-
-{milestone_data.get('details', '')}
-
-**Join the action:**
-- 🌐 Dashboard: https://codedao-org.github.io/dashboard.html
-- 🚀 Get Started: https://codedao-org.github.io/get-started.html
-
-*Posted by CodeDAOAgent*"""
+            context = self.get_context(subreddit_name)
+            title, content = format_milestone(milestone_data)
             
-            submission = self.subreddit.submit(title=title, selftext=content)
-            submission.mod.flair(text="Milestone", css_class="milestone")
+            submission = context.write(self.subreddit_for(context).submit, title=title, selftext=content)
+            context.write(submission.mod.flair, text="Milestone", css_class="milestone")
             
             logger.info(f"Posted milestone: {submission.url}")
             return submission
@@ -133,20 +386,64 @@ Happy coding! 🚀
             logger.error(f"Error posting milestone: {e}")
             return None
     
-    def run_scheduler(self):
-        """Run the scheduled tasks"""
-        # Schedule weekly thread for Mondays at 9 AM
-        schedule.every().monday.at("09:00").do(self.post_weekly_thread)
+    def build_scheduler(self):
+        """Scheduler with each subreddit's weekly thread job (BotConfig.get_weekly_cron),
+        plus a job that re-fetches the bot's identity once IDENTITY_TTL_SECONDS have passed"""
+        from .scheduler import Scheduler
+        
+        scheduler = Scheduler()
+        scheduler.add_job("refresh_identity", "*/10 * * * *", self.refresh_identity)
+        for context in self.contexts.values():
+            if context.config.WEEKLY_THREAD_ENABLED:
+                scheduler.add_job(f"weekly_thread:{context.name}", context.config.get_weekly_cron(),
+                                  lambda name=context.name: self.post_weekly_thread(name))
+        return scheduler
+    
+    def run_scheduler(self, monitor=None, restart_seconds=60):
+        """Run the scheduled tasks, plus the new-post monitor in a background thread.
+
+        Sleeps until the next job is due rather than polling. SIGINT/SIGTERM
+        stop both the scheduler and the monitor. `monitor` defaults to
+        BotConfig.MONITOR_NEW_POSTS; a failed stream is restarted after
+        restart_seconds.
+        """
+        scheduler = self.build_scheduler()
+        stop_event = scheduler.stop_event
+        
+        def supervise_monitor():
+            while not stop_event.is_set():
+                self.monitor_new_posts(stop_event)
+                stop_event.wait(restart_seconds)
+        
+        if monitor is None:
+            monitor = self.config.MONITOR_NEW_POSTS
+        monitor_thread = None
+        if monitor:
+            monitor_thread = threading.Thread(target=supervise_monitor, name="stream-monitor", daemon=True)
+            monitor_thread.start()
+        
+        previous_handlers = {}
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                previous_handlers[signum] = signal.signal(signum, lambda *_: scheduler.stop())
         
         logger.info("Scheduler started. Waiting for scheduled tasks...")
-        while True:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
+        try:
+            scheduler.run()
+            stop_event.wait()  # No jobs left: keep serving the monitor until stopped
+        finally:
+            scheduler.stop()
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+            if monitor_thread is not None:
+                monitor_thread.join()
+            logger.info("Scheduler stopped")
 
 if __name__ == "__main__":
+    # Run as a module: python -m reddit_bot.bot
     bot = CodeDAOBot()
     
     # For testing, uncomment one of these:
     # bot.post_weekly_thread()  # Test weekly post
-    # bot.monitor_new_posts()   # Monitor for new posts
-    bot.run_scheduler()         # Run scheduled tasks 
\ No newline at end of file
+    # bot.monitor_new_posts()   # Monitor for new posts only
+    bot.run_scheduler()         # Scheduled tasks + new-post monitor until SIGINT/SIGTERM
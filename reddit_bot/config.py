@@ -1,94 +1,227 @@
 import os
 from datetime import time
+from .scheduler import weekly_cron
+
+_environment_loaded = False
+
+def _platform_injects_env():
+    """Serverless platforms provide env vars directly; no .env file to read"""
+    return bool(
+        os.getenv("AWS_LAMBDA_FUNCTION_NAME") or os.getenv("VERCEL") or os.getenv("NETLIFY")
+        or os.getenv("REDDIT_SERVERLESS", "false").lower() == "true"
+    )
+
+def load_environment():
+    """Load .env once per process (deferred so importing the package stays cheap)"""
+    global _environment_loaded
+    if not _environment_loaded:
+        if not _platform_injects_env():
+            from dotenv import load_dotenv
+            load_dotenv()
+        _environment_loaded = True
+
+def default_path(filename):
+    """Default location for a storage file: REDDIT_DATA_DIR if set (e.g. an EFS mount), else the
+    working directory, or /tmp on serverless platforms, where it is the only writable path.
+
+    /tmp belongs to one container and is lost on every cold start.
+    """
+    data_dir = os.getenv("REDDIT_DATA_DIR") or ("/tmp" if _platform_injects_env() else "")
+    return os.path.join(data_dir, filename) if data_dir else filename
+
+def default_log_file():
+    """REDDIT_LOG_FILE default: reddit_bot.log, or none (stderr only) on serverless platforms"""
+    return "" if _platform_injects_env() else "reddit_bot.log"
+
+def partition_path(path, subreddit):
+    """Per-subreddit variant of a storage path: analytics.json -> analytics.<sub>.json"""
+    base, ext = os.path.splitext(path)
+    return f"{base}.{subreddit.lower()}{ext}"
 
 class BotConfig:
-    """Configuration for Reddit bot automation"""
+    """Configuration for Reddit bot automation.
+
+    ``BotConfig(subreddit="name")`` is the view for one subreddit of a
+    multi-subreddit deployment: per-subreddit settings (schedule, welcome,
+    milestone, engagement, rate limits, content) can be overridden for it with
+    ``<VAR>__<SUBREDDIT>`` (e.g. ``REDDIT_WELCOME_MAX_HOUR__PYTHON=2``), and
+    every subreddit but the first gets its own analytics file and
+    known-authors index.
+    """
     
-    def __init__(self):
+    def __init__(self, subreddit=None):
+        load_environment()
+        
+        # SUBREDDITS (one shared stream over all of them)
+        names = os.getenv("REDDIT_SUBREDDITS") or os.getenv("REDDIT_SUBREDDIT", "CodeDAO")
+        self.SUBREDDITS = [name.strip() for name in names.split(",") if name.strip()]
+        self.SUBREDDIT = subreddit or self.SUBREDDITS[0]
+        self.PARTITIONED = self.SUBREDDIT.lower() != self.SUBREDDITS[0].lower()
+        
         # Load from environment variables with defaults
+        getenv = self._getenv
         
         # SCHEDULING SETTINGS
-        self.WEEKLY_THREAD_DAY = os.getenv("REDDIT_WEEKLY_DAY", "monday")  # monday, tuesday, etc.
-        self.WEEKLY_THREAD_TIME = os.getenv("REDDIT_WEEKLY_TIME", "09:00")  # HH:MM format
-        self.WEEKLY_THREAD_ENABLED = os.getenv("REDDIT_WEEKLY_ENABLED", "true").lower() == "true"
+        self.WEEKLY_THREAD_DAY = getenv("REDDIT_WEEKLY_DAY", "monday")  # monday, tuesday, etc.
+        self.WEEKLY_THREAD_TIME = getenv("REDDIT_WEEKLY_TIME", "09:00")  # HH:MM format
+        self.WEEKLY_THREAD_ENABLED = getenv("REDDIT_WEEKLY_ENABLED", "true").lower() == "true"
+        self.WEEKLY_THREAD_CRON = getenv("REDDIT_WEEKLY_CRON", "")  # Overrides day/time when set
         
         # WELCOME MESSAGE SETTINGS
-        self.WELCOME_ENABLED = os.getenv("REDDIT_WELCOME_ENABLED", "true").lower() == "true"
-        self.WELCOME_DELAY_MINUTES = int(os.getenv("REDDIT_WELCOME_DELAY", "10"))  # Wait before welcoming
-        self.WELCOME_MAX_PER_HOUR = int(os.getenv("REDDIT_WELCOME_MAX_HOUR", "5"))  # Rate limiting
+        self.WELCOME_ENABLED = getenv("REDDIT_WELCOME_ENABLED", "true").lower() == "true"
+        self.WELCOME_DELAY_MINUTES = int(getenv("REDDIT_WELCOME_DELAY", "10"))  # Wait before welcoming
+        self.WELCOME_MAX_PER_HOUR = int(getenv("REDDIT_WELCOME_MAX_HOUR", "5"))  # Rate limiting
+        self.WELCOME_BATCH_SIZE = int(getenv("REDDIT_WELCOME_BATCH", "25"))  # Due welcomes fetched per request
         
         # MILESTONE SETTINGS
-        self.MILESTONE_ENABLED = os.getenv("REDDIT_MILESTONE_ENABLED", "true").lower() == "true"
-        self.MILESTONE_MIN_INTERVAL_HOURS = int(os.getenv("REDDIT_MILESTONE_MIN_HOURS", "24"))
+        self.MILESTONE_ENABLED = getenv("REDDIT_MILESTONE_ENABLED", "true").lower() == "true"
+        self.MILESTONE_MIN_INTERVAL_HOURS = int(getenv("REDDIT_MILESTONE_MIN_HOURS", "24"))
+        self.MILESTONE_WINDOW_SECONDS = int(getenv("REDDIT_MILESTONE_WINDOW", "300"))  # Coalesce dispatches
         
         # ENGAGEMENT SETTINGS
-        self.MONITOR_NEW_POSTS = os.getenv("REDDIT_MONITOR_POSTS", "true").lower() == "true"
-        self.AUTO_REPLY_KEYWORDS = os.getenv("REDDIT_AUTO_KEYWORDS", "help,question,stuck").split(",")
-        self.ENGAGEMENT_BOOST_ENABLED = os.getenv("REDDIT_ENGAGEMENT_BOOST", "false").lower() == "true"
+        self.MONITOR_NEW_POSTS = getenv("REDDIT_MONITOR_POSTS", "true").lower() == "true"
+        self.AUTO_REPLY_KEYWORDS = getenv("REDDIT_AUTO_KEYWORDS", "help,question,stuck").split(",")
+        self.ENGAGEMENT_BOOST_ENABLED = getenv("REDDIT_ENGAGEMENT_BOOST", "false").lower() == "true"
+        self.BATCH_MAX_POSTS = int(os.getenv("REDDIT_BATCH_MAX_POSTS", "1000"))  # Reddit listings stop at 1000
+        self.ASYNC_ENGINE = os.getenv("REDDIT_ASYNC_ENGINE", "false").lower() == "true"  # asyncpraw batch welcomes
         
         # RATE LIMITING
-        self.RATE_LIMIT_SECONDS = int(os.getenv("REDDIT_RATE_LIMIT", "2"))
-        self.MAX_ACTIONS_PER_HOUR = int(os.getenv("REDDIT_MAX_ACTIONS_HOUR", "30"))
+        self.RATE_LIMIT_SECONDS = int(getenv("REDDIT_RATE_LIMIT", "2"))
+        self.MAX_ACTIONS_PER_HOUR = int(getenv("REDDIT_MAX_ACTIONS_HOUR", "30"))
         
         # CONTENT CUSTOMIZATION
-        self.CUSTOM_WEEKLY_TITLE = os.getenv("REDDIT_CUSTOM_WEEKLY_TITLE", "")
-        self.CUSTOM_WELCOME_MESSAGE = os.getenv("REDDIT_CUSTOM_WELCOME", "")
+        self.CUSTOM_WEEKLY_TITLE = getenv("REDDIT_CUSTOM_WEEKLY_TITLE", "")
+        self.CUSTOM_WELCOME_MESSAGE = getenv("REDDIT_CUSTOM_WELCOME", "")
         
         # SERVERLESS MODE
         self.SERVERLESS_MODE = os.getenv("REDDIT_SERVERLESS", "false").lower() == "true"
         self.WEBHOOK_SECRET = os.getenv("REDDIT_WEBHOOK_SECRET", "")
+        # Longest a write may wait for rate-limit budget (blank = wait as long as needed);
+        # capped on any serverless platform so a drained budget can't outlast the invocation
+        serverless = self.SERVERLESS_MODE or _platform_injects_env()
+        max_wait = os.getenv("REDDIT_RATE_LIMIT_MAX_WAIT", "10" if serverless else "")
+        self.RATE_LIMIT_MAX_WAIT = float(max_wait) if max_wait else None
+        self.HEALTH_CHECK_SECONDS = int(os.getenv("REDDIT_HEALTH_CHECK_SECONDS", "300"))  # Warm client re-check
+        self.IDENTITY_TTL_SECONDS = int(os.getenv("REDDIT_IDENTITY_TTL", "3600"))  # Cached user.me() lifetime
+        self.IDEMPOTENCY_TTL_SECONDS = int(os.getenv("REDDIT_IDEMPOTENCY_TTL", "86400"))  # How long handled events are remembered
+        self.IDEMPOTENCY_LEASE_SECONDS = int(os.getenv("REDDIT_IDEMPOTENCY_LEASE", "900"))  # In-progress claim lifetime
+        
+        # STORAGE (defaults under REDDIT_DATA_DIR, or /tmp on serverless platforms, see default_path)
+        self.ANALYTICS_FILE = self._storage_path("REDDIT_ANALYTICS_FILE", default_path("reddit_bot_analytics.json"))
+        self.STATE_FILE = os.getenv("REDDIT_STATE_FILE", default_path("reddit_bot_state.json"))  # High-water marks etc.
+        self.AUTHOR_INDEX_FILE = self._storage_path("REDDIT_AUTHOR_INDEX_FILE", default_path("reddit_bot_authors.txt"))
+        self.WELCOME_QUEUE_FILE = os.getenv("REDDIT_WELCOME_QUEUE_FILE", default_path("reddit_bot_welcomes.db"))  # Pending welcomes
+        self.IDEMPOTENCY_FILE = os.getenv("REDDIT_IDEMPOTENCY_FILE", default_path("reddit_bot_idempotency.db"))  # Handled actions
+    
+    def _getenv(self, key, default=None):
+        """Environment setting, preferring this subreddit's KEY__SUBREDDIT override"""
+        value = os.getenv(f"{key}__{self.SUBREDDIT.upper()}")
+        return value if value is not None else os.getenv(key, default)
+    
+    def _storage_path(self, key, default):
+        """Storage file for this subreddit: explicit override, else the shared path partitioned"""
+        override = os.getenv(f"{key}__{self.SUBREDDIT.upper()}")
+        if override:
+            return override
+        path = os.getenv(key, default)
+        return partition_path(path, self.SUBREDDIT) if self.PARTITIONED else path
+    
+    def for_subreddit(self, subreddit):
+        """Config view for one of SUBREDDITS"""
+        return BotConfig(subreddit=subreddit)
     
     def get_weekly_schedule(self):
         """Get the weekly thread schedule"""
         return {
             "day": self.WEEKLY_THREAD_DAY,
             "time": self.WEEKLY_THREAD_TIME,
+            "cron": self.get_weekly_cron(),
             "enabled": self.WEEKLY_THREAD_ENABLED
         }
     
+    def get_weekly_cron(self):
+        """Cron expression (UTC) for the weekly thread"""
+        if self.WEEKLY_THREAD_CRON:
+            return self.WEEKLY_THREAD_CRON
+        return weekly_cron(self.WEEKLY_THREAD_DAY, self.WEEKLY_THREAD_TIME)
+    
     def get_welcome_config(self):
         """Get welcome message configuration"""
         return {
             "enabled": self.WELCOME_ENABLED,
             "delay_minutes": self.WELCOME_DELAY_MINUTES,
-            "max_per_hour": self.WELCOME_MAX_PER_HOUR
+            "max_per_hour": self.WELCOME_MAX_PER_HOUR,
+            "batch_size": self.WELCOME_BATCH_SIZE
         }
     
     def get_rate_limits(self):
         """Get rate limiting configuration"""
         return {
             "seconds_between_actions": self.RATE_LIMIT_SECONDS,
-            "max_actions_per_hour": self.MAX_ACTIONS_PER_HOUR
+            "max_actions_per_hour": self.MAX_ACTIONS_PER_HOUR,
+            "max_wait_seconds": self.RATE_LIMIT_MAX_WAIT
         }
 
 # Example .env additions for full control:
 EXAMPLE_ENV_CONFIG = """
 # REDDIT BOT AUTOMATION SETTINGS
 
+# Subreddits (one process, one combined stream)
+REDDIT_SUBREDDITS=CodeDAO,CodeDAOHelp  # Defaults to REDDIT_SUBREDDIT
+# Schedule, welcome, milestone, engagement, rate limit and content settings can be
+# overridden per subreddit with <VAR>__<SUBREDDIT>, e.g.
+# REDDIT_WELCOME_MAX_HOUR__CODEDAOHELP=10
+
 # Weekly Thread Schedule
 REDDIT_WEEKLY_DAY=monday          # monday, tuesday, wednesday, etc.
-REDDIT_WEEKLY_TIME=09:00          # 24-hour format HH:MM
+REDDIT_WEEKLY_TIME=09:00          # 24-hour format HH:MM (UTC)
 REDDIT_WEEKLY_ENABLED=true        # true/false
+REDDIT_WEEKLY_CRON=               # Optional cron instead of day/time, e.g. "0 9 * * 1" or "cron(0 9 ? * MON *)"
 
 # Welcome Messages
 REDDIT_WELCOME_ENABLED=true       # Auto-welcome new users
 REDDIT_WELCOME_DELAY=10           # Minutes to wait before welcoming
 REDDIT_WELCOME_MAX_HOUR=5         # Max welcomes per hour
+REDDIT_WELCOME_BATCH=25           # Due welcomes drained per batch
 
 # Milestone Posts
 REDDIT_MILESTONE_ENABLED=true     # Auto-post milestones
 REDDIT_MILESTONE_MIN_HOURS=24     # Min hours between milestone posts
+REDDIT_MILESTONE_WINDOW=300       # Seconds to collect milestones into one dispatch
 
 # Engagement Monitoring
 REDDIT_MONITOR_POSTS=true         # Monitor new posts for responses
 REDDIT_AUTO_KEYWORDS=help,question,stuck,bug  # Keywords to auto-respond to
 REDDIT_ENGAGEMENT_BOOST=false     # Auto-upvote quality posts
+REDDIT_BATCH_MAX_POSTS=1000       # Max new posts per monitor_posts batch
+REDDIT_ASYNC_ENGINE=false         # Welcome batches concurrently via asyncpraw (pip install asyncpraw)
 
 # Rate Limiting (respect Reddit rules!)
 REDDIT_RATE_LIMIT=2               # Seconds between actions
 REDDIT_MAX_ACTIONS_HOUR=30        # Max actions per hour
+REDDIT_RATE_LIMIT_MAX_WAIT=       # Max seconds a write waits for budget (default: 10 serverless, unlimited otherwise)
 
 # Serverless Mode
 REDDIT_SERVERLESS=false           # true for serverless deployment
 REDDIT_WEBHOOK_SECRET=your_secret # For webhook authentication
+REDDIT_HEALTH_CHECK_SECONDS=300   # Re-verify a warm Reddit client after this long
+REDDIT_IDENTITY_TTL=3600          # Seconds to cache the bot's own account (user.me()); re-checked every 10 min
+REDDIT_IDEMPOTENCY_TTL=86400      # Retried weekly_thread/milestone events within this window are not re-run
+REDDIT_IDEMPOTENCY_LEASE=900      # A run killed mid-way blocks retries this long (Lambda: its remaining time)
+
+# Self-hosted action receiver (python -m reddit_bot.webhook_server)
+REDDIT_RECEIVER_PORT=8080         # Signed POST /actions, GET /jobs/<id>
+REDDIT_RECEIVER_HOST=0.0.0.0      # Needs REDDIT_WEBHOOK_SECRET unless 127.0.0.1
+REDDIT_RECEIVER_WORKERS=1         # Worker threads; bot actions still run one at a time
+REDDIT_RECEIVER_QUEUE=100         # Pending actions before 503 + Retry-After
+
+# Storage
+# (serverless platforms default these to /tmp/<name> and REDDIT_LOG_FILE to empty)
+REDDIT_DATA_DIR=                                  # Directory for every file below, e.g. an EFS mount
+REDDIT_LOG_FILE=reddit_bot.log                    # Empty: log to stderr only
+REDDIT_ANALYTICS_FILE=reddit_bot_analytics.json
+REDDIT_STATE_FILE=reddit_bot_state.json          # Bot bookkeeping (batch high-water mark)
+REDDIT_AUTHOR_INDEX_FILE=reddit_bot_authors.txt  # Known posters (first-post detection)
+REDDIT_WELCOME_QUEUE_FILE=reddit_bot_welcomes.db # SQLite queue of delayed welcomes
+REDDIT_IDEMPOTENCY_FILE=reddit_bot_idempotency.db # SQLite record of handled actions (dedupes retries)
 """ 
\ No newline at end of file
@@ -0,0 +1,91 @@
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+GITHUB_API_URL = "https://api.github.com"
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) seconds
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+class GitHubRetry(Retry):
+    """Retry failed GitHub requests with exponential backoff, without repeating writes.
+
+    Idempotent methods (GET, PUT, DELETE, ...) retry connect errors, read
+    timeouts and 5xx/429. A POST such as workflow_dispatch may already have
+    taken effect when its response is lost or a 5xx comes back, so it is only
+    retried when GitHub cannot have acted on it: connect errors, and
+    rate-limit refusals (403/429 with Retry-After). GitHub signals secondary
+    rate limits that way and urllib3 honours the Retry-After; a 403 without
+    it (bad token, primary limit exhausted until reset) is returned to the
+    caller.
+    """
+
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    RATE_LIMIT_STATUSES = frozenset({403, 429})
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if status_code in self.RATE_LIMIT_STATUSES and has_retry_after:
+            return self.total is None or self.total > 0
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+class GitHubSession(requests.Session):
+    """requests.Session for the GitHub REST API.
+
+    Auth and API headers are set once, paths may be relative to the API base
+    URL, every request gets a default timeout, and connections are kept alive
+    in a pool shared by all callers of get_session().
+    """
+
+    def __init__(self, token=None, api_url=None, pool_size=None, timeout=DEFAULT_TIMEOUT, retries=4):
+        super().__init__()
+        self.api_url = (api_url or os.getenv("GITHUB_API_URL") or GITHUB_API_URL).rstrip("/")
+        self.timeout = timeout
+        self.headers.update({
+            "Accept": "application/vnd.github.v3+json",
+            "User-Agent": "codedao-bot",
+        })
+        if token:
+            self.headers["Authorization"] = f"token {token}"
+
+        retry = GitHubRetry(
+            total=retries,
+            backoff_factor=0.5,
+            status_forcelist=GitHubRetry.RETRY_STATUSES,
+            allowed_methods=GitHubRetry.DEFAULT_ALLOWED_METHODS,  # 5xx/read retries: idempotent methods only
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        pool_size = pool_size or int(os.getenv("GITHUB_POOL_SIZE", "10"))
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        if not url.startswith(("http://", "https://")):
+            url = f"{self.api_url}/{url.lstrip('/')}"
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, *args, **kwargs)
+
+
+def get_session(token=None, api_url=None):
+    """Process-wide GitHubSession per (token, API URL), created on first use"""
+    key = (token, api_url)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = GitHubSession(token, api_url)
+            _sessions[key] = session
+        return session
+
+
+def close_sessions():
+    """Close every pooled session (tests, benchmarks, shutdown)"""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -0,0 +1,91 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+
+def idempotency_key(event):
+    """Dedupe key for a handler event, taken from the event itself.
+
+    An explicit ``idempotency_key`` or the platform event ``id`` (EventBridge
+    retries reuse it) wins. Otherwise the key is the action, target subreddit,
+    payload hash and the event's own ``time``/``timestamp`` when it carries
+    one. A retry redelivers the same event, so it maps to the same key however
+    late it arrives; how long keys are remembered is the store's TTL alone.
+    """
+    explicit = event.get('idempotency_key') or event.get('id')
+    if explicit:
+        return f"event:{explicit}"
+    payload = {name: event.get(name) for name in ('milestone_data', 'milestones') if event.get(name)}
+    digest = hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+    key = f"{event.get('action')}:{event.get('subreddit') or '*'}:{digest}"
+    occurred = event.get('time') or event.get('timestamp')
+    return f"{key}:{occurred}" if occurred else key
+
+
+class IdempotencyStore:
+    """SQLite record of handled keys and their results, expiring after a TTL.
+
+    claim() atomically marks a key in progress for a short lease (about the
+    function timeout); a second claim of a live key gets the first one's
+    record back instead. A claim whose run was killed before complete() or
+    release() expires with its lease and can be taken over. complete() keeps
+    the result for the full TTL. Expired rows are evicted lazily.
+    """
+
+    EVICT_EVERY = 100  # claims between expiry sweeps
+
+    def __init__(self, db_file="reddit_bot_idempotency.db"):
+        self.db_file = db_file
+        self._lock = threading.Lock()
+        self._claims = 0
+        self.conn = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS idempotency_keys ("
+            " key TEXT PRIMARY KEY, status TEXT NOT NULL, result TEXT, expires REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idempotency_keys_expires ON idempotency_keys (expires)")
+
+    def claim(self, key, lease, now=None):
+        """Mark key in progress for `lease` seconds; returns None if claimed, else the prior {"status", "result"}"""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._claims += 1
+            if self._claims % self.EVICT_EVERY == 1:
+                self.conn.execute("DELETE FROM idempotency_keys WHERE expires <= ?", (now,))
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.conn.execute(
+                    "SELECT status, result FROM idempotency_keys WHERE key = ? AND expires > ?", (key, now)
+                ).fetchone()
+                if row is None:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO idempotency_keys (key, status, result, expires) VALUES (?, ?, NULL, ?)",
+                        (key, "in_progress", now + lease)
+                    )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return {"status": row[0], "result": json.loads(row[1]) if row[1] else None}
+
+    def complete(self, key, result, ttl, now=None):
+        """Record the result a claimed key produced"""
+        now = time.time() if now is None else now
+        with self._lock:
+            self.conn.execute(
+                "UPDATE idempotency_keys SET status = ?, result = ?, expires = ? WHERE key = ?",
+                ("completed", json.dumps(result, default=str), now + ttl, key)
+            )
+
+    def release(self, key):
+        """Forget a claim whose action failed, so a retry can run it"""
+        with self._lock:
+            self.conn.execute("DELETE FROM idempotency_keys WHERE key = ?", (key,))
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,140 @@
+import logging
+import threading
+import time
+from .config import BotConfig
+from .state import BotState
+
+logger = logging.getLogger(__name__)
+
+
+def combine_milestones(milestones):
+    """Merge several milestone_data dicts into one announcement"""
+    if len(milestones) == 1:
+        return dict(milestones[0])
+    lines = []
+    for milestone in milestones:
+        line = f"- **{milestone.get('title', 'New Achievement!')}**"
+        if milestone.get("description"):
+            line += f": {milestone['description']}"
+        lines.append(line)
+    return {
+        "type": "batch",
+        "title": f"{len(milestones)} new milestones reached!",
+        "description": "The CodeDAO community has been busy!",
+        "details": "\n".join(lines),
+    }
+
+
+class MilestoneCoalescer:
+    """Batches milestone dispatches so a burst costs one GitHub Actions run.
+
+    Milestones added within MILESTONE_WINDOW_SECONDS of the first pending one
+    go out together as a single workflow_dispatch, and dispatches are at least
+    MILESTONE_MIN_INTERVAL_HOURS apart. Pending milestones live in BotState,
+    so they survive restarts. Long-running processes call start() to flush
+    on a timer; serverless callers just call flush() from their cron.
+    """
+
+    STATE_KEY = "milestone_dispatch"
+    RETRY_SECONDS = 60
+
+    def __init__(self, webhook=None, config=None, state=None):
+        if webhook is None:
+            from .webhook_integration import GitHubActionsWebhook
+            webhook = GitHubActionsWebhook()
+        self.webhook = webhook
+        self.config = config or BotConfig()
+        self.state = state or BotState(self.config.STATE_FILE)
+        self.window = self.config.MILESTONE_WINDOW_SECONDS
+        self.min_interval = self.config.MILESTONE_MIN_INTERVAL_HOURS * 3600
+        self._lock = threading.Lock()
+        self._timer = None
+        self._running = False
+
+    def _load(self):
+        self.state.reload()
+        return self.state.get(self.STATE_KEY) or {"pending": [], "first_queued": None, "last_dispatch": 0.0}
+
+    def _due_at(self, doc):
+        if not doc["pending"]:
+            return None
+        return max(doc["first_queued"] + self.window, doc["last_dispatch"] + self.min_interval)
+
+    def pending(self):
+        """Milestones waiting for the next dispatch"""
+        return list(self._load()["pending"])
+
+    def due_at(self):
+        """When the pending batch will be dispatched (epoch seconds), or None"""
+        return self._due_at(self._load())
+
+    def add(self, milestone_data, now=None):
+        """Queue a milestone; returns when its batch is due"""
+        now = time.time() if now is None else now
+        with self._lock:
+            doc = self._load()
+            if not doc["pending"]:
+                doc["first_queued"] = now
+            doc["pending"].append(milestone_data)
+            self.state.set(self.STATE_KEY, doc)
+            due = self._due_at(doc)
+        logger.info(f"Queued milestone '{milestone_data.get('title')}', {len(doc['pending'])} pending until {due:.0f}")
+        self._arm()
+        return due
+
+    def flush(self, now=None, force=False):
+        """Dispatch the pending batch if it is due (or force); returns the dispatch result or None"""
+        now = time.time() if now is None else now
+        with self._lock:
+            doc = self._load()
+            due = self._due_at(doc)
+            if due is None or (now < due and not force):
+                return None
+            batch = doc["pending"]
+            result = self.webhook.trigger_milestone_posts(batch)
+            if result.get("success"):
+                # Keep anything added by another process while we were dispatching
+                doc = self._load()
+                remaining = doc["pending"][len(batch):]
+                doc.update(pending=remaining, first_queued=now if remaining else None, last_dispatch=now)
+                self.state.set(self.STATE_KEY, doc)
+                logger.info(f"Dispatched {len(batch)} coalesced milestones")
+            else:
+                logger.error(f"Milestone dispatch failed: {result.get('error')}")
+            return result
+
+    def start(self):
+        """Flush on a timer from now on (re-arms for milestones left pending by a previous run)"""
+        self._running = True
+        self._arm()
+
+    def stop(self):
+        self._running = False
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _arm(self, delay=None):
+        if not self._running:
+            return
+        if delay is None:
+            due = self.due_at()
+            if due is None:
+                return
+            delay = max(0.0, due - time.time())
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(delay, self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_timer(self):
+        try:
+            result = self.flush()
+        except Exception as e:
+            logger.error(f"Error dispatching milestones: {e}")
+            result = {"success": False}
+        if result is not None and not result.get("success"):
+            self._arm(self.RETRY_SECONDS)
+        else:
+            self._arm()
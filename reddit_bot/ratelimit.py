@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+
+class RateLimitExceeded(Exception):
+    """Raised when a write would have to wait longer than the caller allows"""
+
+class RateLimiter:
+    """Token buckets shared by every outbound Reddit write.
+
+    - "actions": MAX_ACTIONS_PER_HOUR, spaced at least RATE_LIMIT_SECONDS apart
+    - "welcome": WELCOME_MAX_PER_HOUR, charged in addition to "actions"
+
+    Buckets refill continuously, so the bot sleeps only when a budget is
+    actually exhausted. Bucket levels live in BotState under ``state_key``
+    (re-read before each acquire) so serverless invocations sharing a state
+    file share one budget.
+    """
+    
+    STATE_KEY = "rate_limits"
+    
+    def __init__(self, config, state, state_key=STATE_KEY):
+        self.state = state
+        self.state_key = state_key
+        self.min_interval = config.RATE_LIMIT_SECONDS
+        # bucket -> (capacity, refill per second)
+        self.buckets = {
+            "actions": (config.MAX_ACTIONS_PER_HOUR, config.MAX_ACTIONS_PER_HOUR / 3600.0),
+            "welcome": (config.WELCOME_MAX_PER_HOUR, config.WELCOME_MAX_PER_HOUR / 3600.0),
+        }
+        self._lock = threading.Lock()
+    
+    def _levels(self, now):
+        """Current token levels after refill, plus the last action time"""
+        saved = self.state.get(self.state_key) or {}
+        levels = {}
+        for name, (capacity, rate) in self.buckets.items():
+            bucket = saved.get(name)
+            if bucket is None:
+                levels[name] = float(capacity)
+            else:
+                elapsed = max(0.0, now - bucket["updated"])
+                levels[name] = min(float(capacity), bucket["tokens"] + elapsed * rate)
+        return levels, saved.get("last_action", 0.0)
+    
+    def wait_time(self, buckets=("actions",), now=None):
+        """Seconds until a write charged to these buckets may proceed"""
+        now = time.time() if now is None else now
+        levels, last_action = self._levels(now)
+        wait = max(0.0, self.min_interval - (now - last_action))
+        for name in buckets:
+            capacity, rate = self.buckets[name]
+            if levels[name] < 1.0:
+                if rate <= 0:
+                    return float("inf")
+                wait = max(wait, (1.0 - levels[name]) / rate)
+        return wait
+    
+    def acquire(self, buckets=("actions",), max_wait=None):
+        """Block until the buckets have a token, then spend it.
+
+        Raises RateLimitExceeded instead of sleeping longer than max_wait seconds.
+        """
+        with self._lock:
+            while True:
+                self.state.reload()
+                wait = self.wait_time(buckets)
+                if wait <= 0:
+                    break
+                if max_wait is not None and wait > max_wait:
+                    raise RateLimitExceeded(f"Reddit write budget {buckets} exhausted for {wait:.0f}s")
+                time.sleep(wait)
+            self._spend(buckets)
+    
+    async def acquire_async(self, buckets=("actions",), max_wait=None):
+        """acquire() for asyncio callers: awaits instead of blocking the event loop"""
+        while True:
+            self.state.reload()
+            wait = self.wait_time(buckets)
+            if wait <= 0:
+                # No await between the check and the spend, so concurrent tasks can't both take the token
+                self._spend(buckets)
+                return
+            if max_wait is not None and wait > max_wait:
+                raise RateLimitExceeded(f"Reddit write budget {buckets} exhausted for {wait:.0f}s")
+            await asyncio.sleep(wait)
+    
+    def _spend(self, buckets):
+        now = time.time()
+        levels, _ = self._levels(now)
+        saved = {"last_action": now}
+        for name, level in levels.items():
+            if name in buckets:
+                level -= 1.0
+            saved[name] = {"tokens": level, "updated": now}
+        self.state.set(self.state_key, saved)
@@ -0,0 +1,137 @@
+import hashlib
+import math
+from datetime import datetime
+
+SECONDS_PER_HOUR = 3600
+
+
+def hour_index(moment):
+    """Whole hours since the epoch for a (naive, local) datetime"""
+    return int(moment.timestamp() // SECONDS_PER_HOUR)
+
+
+class DistinctSketch:
+    """Small HyperLogLog sketch for counting distinct usernames.
+
+    256 one-byte registers (~6.5% standard error); small cardinalities fall
+    back to linear counting, which is close to exact for weekly welcome volumes.
+    """
+
+    PRECISION = 8
+    REGISTERS = 1 << PRECISION
+
+    def __init__(self, registers=None):
+        self.registers = registers if registers is not None else bytearray(self.REGISTERS)
+
+    def add(self, value):
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest()
+        hashed = int.from_bytes(digest, 'big')
+        index = hashed >> (64 - self.PRECISION)
+        remaining = hashed & ((1 << (64 - self.PRECISION)) - 1)
+        rank = (64 - self.PRECISION) - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        """Fold another sketch's registers into this one"""
+        mine = self.registers
+        for i, value in enumerate(other.registers):
+            if value > mine[i]:
+                mine[i] = value
+
+    def estimate(self):
+        m = self.REGISTERS
+        zeros = self.registers.count(0)
+        if zeros == m:
+            return 0
+        raw = (0.7213 / (1 + 1.079 / m)) * m * m / sum(2.0 ** -r for r in self.registers)
+        if raw <= 2.5 * m and zeros:
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+
+class _HourBucket:
+    __slots__ = ("hour", "threads", "welcomes", "milestones", "engagement", "users")
+
+    def __init__(self, hour):
+        self.hour = hour
+        self.threads = 0
+        self.welcomes = 0
+        self.milestones = 0
+        self.engagement = 0
+        self.users = None
+
+
+class RollingCounters:
+    """Hourly ring buffer of event counters plus per-hour distinct-user sketches.
+
+    Updated once per logged event; window queries touch at most one bucket per
+    hour in the window, independent of total history.
+    """
+
+    def __init__(self, retention_hours=24 * 31):
+        self.retention_hours = retention_hours
+        self.buckets = [None] * retention_hours
+
+    def _bucket(self, hour):
+        slot = hour % self.retention_hours
+        bucket = self.buckets[slot]
+        if bucket is None or bucket.hour != hour:
+            bucket = _HourBucket(hour)
+            self.buckets[slot] = bucket
+        return bucket
+
+    def observe(self, event_type, record, moment):
+        """Count one analytics event at the given time"""
+        bucket = self._bucket(hour_index(moment))
+        if event_type == "weekly_thread":
+            bucket.threads += 1
+            bucket.engagement += record.get("upvotes", 0) + record.get("comments", 0)
+        elif event_type == "welcome_message":
+            bucket.welcomes += 1
+            if bucket.users is None:
+                bucket.users = DistinctSketch()
+            bucket.users.add(record["username"])
+        elif event_type == "milestone_post":
+            bucket.milestones += 1
+
+    def rebuild(self, data, now=None):
+        """Cold start: refill the ring buffer from the event lists in an analytics document.
+
+        Lists are in append order, so each is walked newest-first and the walk
+        stops at the first record older than the retention window.
+        """
+        self.buckets = [None] * self.retention_hours
+        oldest_hour = hour_index(now or datetime.now()) - self.retention_hours + 1
+        for event_type, key in (("weekly_thread", "weekly_threads"),
+                                ("welcome_message", "welcome_messages"),
+                                ("milestone_post", "milestone_posts")):
+            for record in reversed(data.get(key, [])):
+                moment = datetime.fromisoformat(record["date"])
+                if hour_index(moment) < oldest_hour:
+                    break
+                self.observe(event_type, record, moment)
+
+    def window_stats(self, window, now=None):
+        """Aggregate the buckets covering the last `window` (a timedelta)"""
+        hours = min(self.retention_hours, max(1, math.ceil(window.total_seconds() / SECONDS_PER_HOUR)))
+        current = hour_index(now or datetime.now())
+        threads = welcomes = milestones = engagement = 0
+        users = DistinctSketch()
+        for hour in range(current - hours + 1, current + 1):
+            bucket = self.buckets[hour % self.retention_hours]
+            if bucket is None or bucket.hour != hour:
+                continue
+            threads += bucket.threads
+            welcomes += bucket.welcomes
+            milestones += bucket.milestones
+            engagement += bucket.engagement
+            if bucket.users is not None:
+                users.merge(bucket.users)
+        return {
+            "threads_posted": threads,
+            "welcome_messages_sent": welcomes,
+            "new_users_welcomed": users.estimate(),
+            "total_engagement": engagement,
+            "milestones_posted": milestones
+        }
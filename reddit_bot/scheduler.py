@@ -0,0 +1,153 @@
+import heapq
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+
+logger = logging.getLogger(__name__)
+
+_DAY_NAMES = {"SUN": 0, "MON": 1, "TUE": 2, "WED": 3, "THU": 4, "FRI": 5, "SAT": 6}
+_MONTH_NAMES = {name: i for i, name in enumerate(
+    ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"], 1)}
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+# Longest single sleep, so a wall-clock change is noticed within this many seconds
+_MAX_SLEEP_SECONDS = 3600
+
+
+def _parse_field(field, low, high, names=None):
+    """Expand one cron field (*, a-b, */n, a-b/n, lists, names) into a set of ints"""
+    values = set()
+    for part in field.upper().split(","):
+        part, _, step = part.partition("/")
+        if part in ("*", "?"):
+            start, end = low, high
+        else:
+            bounds = [names.get(p, p) if names else p for p in part.split("-")]
+            try:
+                start, end = int(bounds[0]), int(bounds[-1])
+            except ValueError:
+                raise ValueError(f"Unsupported cron field: {field}")
+            if step and len(bounds) == 1:
+                end = high
+        if not (low <= start <= high and low <= end <= high):
+            raise ValueError(f"Cron field out of range {low}-{high}: {field}")
+        values.update(range(start, end + 1, int(step) if step else 1))
+    return values
+
+
+class CronSchedule:
+    """A cron expression and its next fire time (UTC).
+
+    Accepts the formats in ``serverless_handler.CRON_EXAMPLES``: standard
+    five-field cron (``0 9 * * 1``) and AWS EventBridge ``cron(0 9 ? * MON *)``
+    (day-of-week 1-7 = SUN-SAT, year must be ``*``).
+    """
+
+    def __init__(self, expression):
+        self.expression = expression
+        fields = expression.strip()
+        aws = fields.startswith("cron(") and fields.endswith(")")
+        fields = fields[5:-1].split() if aws else fields.split()
+        if aws:
+            if len(fields) != 6 or fields[5] != "*":
+                raise ValueError(f"Unsupported EventBridge cron: {expression}")
+            fields = fields[:5]
+        if len(fields) != 5:
+            raise ValueError(f"Expected 5 cron fields: {expression}")
+        minute, hour, day, month, weekday = fields
+
+        self.minutes = _parse_field(minute, 0, 59)
+        self.hours = _parse_field(hour, 0, 23)
+        self.days = _parse_field(day, 1, 31)
+        self.months = _parse_field(month, 1, 12, _MONTH_NAMES)
+        if aws:
+            # EventBridge numbers days 1 (SUN) - 7 (SAT)
+            names = {name: str(value + 1) for name, value in _DAY_NAMES.items()}
+            self.weekdays = {value - 1 for value in _parse_field(weekday, 1, 7, names)}
+        else:
+            self.weekdays = {value % 7 for value in _parse_field(weekday, 0, 7, _DAY_NAMES)}
+        # Standard cron: when both day fields are restricted, either may match
+        self._day_restricted = day not in ("*", "?")
+        self._weekday_restricted = weekday not in ("*", "?")
+
+    def _day_matches(self, moment):
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._day_restricted and self._weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, moment):
+        """First fire time strictly after `moment` (aware datetime)"""
+        t = moment.astimezone(timezone.utc).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = t + timedelta(days=366 * 5)
+        while t < limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(t):
+                t = t.replace(hour=0, minute=0) + timedelta(days=1)
+            elif t.hour not in self.hours:
+                t = t.replace(minute=0) + timedelta(hours=1)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                return t
+        raise ValueError(f"Cron expression never fires: {self.expression}")
+
+
+def weekly_cron(day, time_of_day):
+    """Cron expression for BotConfig's weekly day name and HH:MM time"""
+    hour, minute = (int(part) for part in time_of_day.split(":"))
+    try:
+        weekday = (WEEKDAYS.index(day.lower()) + 1) % 7
+    except ValueError:
+        raise ValueError(f"Unknown weekday: {day}")
+    return f"{minute} {hour} * * {weekday}"
+
+
+class Scheduler:
+    """Runs jobs at their cron times, sleeping until the next one is due.
+
+    Jobs wait on a heap keyed by next fire time; between fires the scheduler
+    blocks on ``stop_event`` so stop() (or a signal handler) ends it at once.
+    """
+
+    def __init__(self):
+        self._heap = []  # (fire_at, seq, name, schedule, func)
+        self._seq = 0
+        self.stop_event = threading.Event()
+
+    def add_job(self, name, schedule, func, now=None):
+        """Schedule func() at every fire time of a cron expression or CronSchedule"""
+        if not isinstance(schedule, CronSchedule):
+            schedule = CronSchedule(schedule)
+        now = now or datetime.now(timezone.utc)
+        self._push(schedule.next_after(now), name, schedule, func)
+        logger.info(f"Scheduled {name} ({schedule.expression}), next run {self.next_run(name)}")
+
+    def _push(self, fire_at, name, schedule, func):
+        self._seq += 1
+        heapq.heappush(self._heap, (fire_at, self._seq, name, schedule, func))
+
+    def next_run(self, name=None):
+        """Next fire time of a job (or of any job)"""
+        times = [entry[0] for entry in self._heap if name is None or entry[2] == name]
+        return min(times) if times else None
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self):
+        """Run due jobs until stop() is called"""
+        while not self.stop_event.is_set() and self._heap:
+            fire_at = self._heap[0][0]
+            delay = (fire_at - datetime.now(timezone.utc)).total_seconds()
+            if delay > 0:
+                self.stop_event.wait(min(delay, _MAX_SLEEP_SECONDS))
+                continue  # Re-check: stopped, woke early, or the clock moved
+            _, _, name, schedule, func = heapq.heappop(self._heap)
+            try:
+                func()
+            except Exception as e:
+                logger.error(f"Scheduled job {name} failed: {e}")
+            self._push(schedule.next_after(max(fire_at, datetime.now(timezone.utc))), name, schedule, func)
@@ -1,16 +1,181 @@
 import json
 import os
+import time
 from datetime import datetime
-from .bot import CodeDAOBot
 from .config import BotConfig
-from .analytics import RedditBotAnalytics
+from .analytics import RedditBotAnalytics, etag_matches
+
+# Objects reused across warm invocations of the same Lambda/Vercel container.
+# Built lazily on first use; reset_warm_state() drops them.
+_warm = {
+    'config': None,
+    'analytics': {},  # subreddit (lowercased) -> RedditBotAnalytics partition
+    'state': None,
+    'bot': None,
+    'bot_checked_at': 0.0,
+    'idempotency': None,
+    'milestones': None,
+    'created_at': None,
+    'invocations': 0,
+}
+
+# Actions that post (or queue a post) and must not run twice for one trigger
+IDEMPOTENT_ACTIONS = ('weekly_thread', 'milestone', 'milestone_enqueue')
+
+def reset_warm_state():
+    """Drop all cached clients so the next invocation rebuilds them"""
+    if _warm['idempotency'] is not None:
+        _warm['idempotency'].close()
+    if _warm['milestones'] is not None:
+        _warm['milestones'].stop()
+    _warm.update(config=None, analytics={}, state=None, bot=None, bot_checked_at=0.0,
+                 idempotency=None, milestones=None, created_at=None, invocations=0)
+
+def get_config():
+    """Process-wide BotConfig"""
+    if _warm['config'] is None:
+        _warm['config'] = BotConfig()
+    return _warm['config']
+
+def get_analytics(subreddit=None):
+    """Process-wide RedditBotAnalytics for one subreddit's partition (default: the first),
+    reloaded if another process wrote to its log"""
+    config = get_config()
+    if subreddit is None:
+        subreddit = config.SUBREDDITS[0]
+    key = subreddit.lower()
+    analytics = _warm['analytics'].get(key)
+    if analytics is None:
+        if key == config.SUBREDDIT.lower():
+            sub_config = config
+        elif key in (name.lower() for name in config.SUBREDDITS):
+            sub_config = config.for_subreddit(subreddit)
+        else:
+            raise ValueError(f"Subreddit not configured: {subreddit}")
+        analytics = RedditBotAnalytics(sub_config.ANALYTICS_FILE)
+        _warm['analytics'][key] = analytics
+    elif analytics.storage.changed_externally():
+        analytics.load_data()
+    return analytics
+
+def get_state():
+    """Process-wide BotState, shared by the bot and the milestone coalescer so neither
+    overwrites the other's keys with a stale copy"""
+    if _warm['state'] is None:
+        from .state import BotState
+        _warm['state'] = BotState(get_config().STATE_FILE)
+    return _warm['state']
+
+def get_bot():
+    """Process-wide CodeDAOBot, re-authenticated when its health check fails"""
+    bot = _warm['bot']
+    now = time.monotonic()
+    if bot is not None and now - _warm['bot_checked_at'] > get_config().HEALTH_CHECK_SECONDS:
+        try:
+            healthy = bot.refresh_identity(force=True) is not None
+        except Exception:
+            healthy = False
+        if healthy:
+            _warm['bot_checked_at'] = now
+        else:
+            bot = None
+    if bot is None:
+        from .bot import CodeDAOBot
+        bot = CodeDAOBot(config=get_config(), state=get_state())
+        _warm['bot'] = bot
+        _warm['bot_checked_at'] = now
+    return bot
+
+def get_idempotency_store():
+    """Process-wide record of handled weekly_thread/milestone events"""
+    if _warm['idempotency'] is None:
+        from .idempotency import IdempotencyStore
+        _warm['idempotency'] = IdempotencyStore(get_config().IDEMPOTENCY_FILE)
+    return _warm['idempotency']
+
+def get_milestone_coalescer():
+    """Process-wide MilestoneCoalescer (no Reddit client needed)"""
+    if _warm['milestones'] is None:
+        from .milestones import MilestoneCoalescer
+        _warm['milestones'] = MilestoneCoalescer(config=get_config(), state=get_state())
+    return _warm['milestones']
+
+def warm_health():
+    """Report which warm objects exist in this container"""
+    return {
+        'config': _warm['config'] is not None,
+        'analytics': sorted(_warm['analytics']),
+        'bot': _warm['bot'] is not None,
+        'idempotency': _warm['idempotency'] is not None,
+        'milestones': _warm['milestones'] is not None,
+        'container_age_seconds': round(time.monotonic() - _warm['created_at'], 1) if _warm['created_at'] else 0,
+        'invocations': _warm['invocations']
+    }
+
+def _claim_lease(context, config):
+    """How long an in-progress claim blocks retries: the rest of this invocation
+    (plus slack) on Lambda, else REDDIT_IDEMPOTENCY_LEASE"""
+    remaining_ms = getattr(context, 'get_remaining_time_in_millis', None)
+    if remaining_ms is not None:
+        return remaining_ms() / 1000 + 30
+    return config.IDEMPOTENCY_LEASE_SECONDS
+
+def _get_header(headers, name):
+    """Case-insensitive header lookup on an event/request headers mapping"""
+    if not headers:
+        return None
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+def analytics_response(analytics, if_none_match=None):
+    """Lambda-style response for the dashboard payload, 304 when the ETag matches"""
+    payload = analytics.get_dashboard_payload()
+    headers = {
+        'Content-Type': 'application/json',
+        'ETag': payload.etag,
+        'Cache-Control': 'no-cache'
+    }
+    if etag_matches(if_none_match, payload.etag):
+        return {'statusCode': 304, 'headers': headers, 'body': ''}
+    return {'statusCode': 200, 'headers': headers, 'body': payload.text}
+
+def _timing_headers(timing):
+    return {
+        'X-Cold-Start': 'true' if timing['cold_start'] else 'false',
+        'X-Init-Ms': str(timing['init_ms']),
+        'X-Invoke-Ms': str(timing['invoke_ms'])
+    }
 
 def lambda_handler(event, context):
     """AWS Lambda handler for Reddit bot"""
+    started = time.perf_counter()
+    cold_start = _warm['created_at'] is None
+    if cold_start:
+        _warm['created_at'] = time.monotonic()
+    _warm['invocations'] += 1
+    timing = {'cold_start': cold_start, 'init_ms': 0.0, 'invoke_ms': 0.0}
+    
+    def init(factory):
+        # Time spent building (or health-checking) warm objects
+        init_started = time.perf_counter()
+        obj = factory()
+        timing['init_ms'] = round(timing['init_ms'] + (time.perf_counter() - init_started) * 1000, 2)
+        return obj
+    
+    def finish(response):
+        # A dict body is serialized here, with the final timing as its metadata
+        timing['invoke_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        if isinstance(response.get('body'), dict):
+            response['body'] = json.dumps(dict(response['body'], metadata=timing))
+        response.setdefault('headers', {}).update(_timing_headers(timing))
+        return response
+    
+    store, key = None, None
     try:
-        config = BotConfig()
-        bot = CodeDAOBot()
-        analytics = RedditBotAnalytics()
+        config = init(get_config)
         
         # Parse the event
         event_type = event.get('source', 'manual')
@@ -18,59 +183,138 @@ def lambda_handler(event, context):
         
         result = None
         
+        # Multi-subreddit deployments may target one subreddit; default is all (weekly) or the first
+        subreddit = event.get('subreddit')
+        
+        # Retried posting events return the first run's result without touching Reddit
+        if action in IDEMPOTENT_ACTIONS:
+            from .idempotency import idempotency_key
+            store = init(get_idempotency_store)
+            key = idempotency_key(dict(event, action=action))
+            prior = store.claim(key, _claim_lease(context, config))
+            if prior is not None:
+                store = None  # Not ours to release
+                in_progress = prior['status'] != 'completed'
+                return finish({
+                    'statusCode': 409 if in_progress else 200,
+                    'headers': {'X-Idempotent-Replay': 'true'},
+                    'body': {
+                        'success': not in_progress,
+                        'action': action,
+                        'duplicate': True,
+                        'result': prior['result'],
+                        'error': 'Action already in progress' if in_progress else None,
+                        'timestamp': datetime.now().isoformat()
+                    }
+                })
+        
         if action == 'weekly_thread':
-            result = bot.post_weekly_thread()
-            if result:
-                analytics.log_weekly_thread(
-                    result.id, 
-                    result.title,
-                    result.score,
-                    result.num_comments
+            bot = init(get_bot)
+            if subreddit:
+                posted = [(subreddit, bot.post_weekly_thread(subreddit))]
+            else:
+                posted = bot.post_weekly_threads()
+            for name, submission in posted:
+                if not submission:
+                    continue
+                init(lambda: get_analytics(name)).log_weekly_thread(
+                    submission.id, 
+                    submission.title,
+                    submission.score,
+                    submission.num_comments
                 )
+            result = {name: submission.id for name, submission in posted if submission}
         
         elif action == 'milestone':
-            milestone_data = event.get('milestone_data', {})
-            result = bot.post_milestone_announcement(milestone_data)
+            bot = init(get_bot)
+            analytics = init(lambda: get_analytics(subreddit))
+            if event.get('milestones'):
+                # Coalesced dispatch (MilestoneCoalescer): one post for the whole batch
+                from .milestones import combine_milestones
+                milestone_data = combine_milestones(event['milestones'])
+            else:
+                milestone_data = event.get('milestone_data', {})
+            result = bot.post_milestone_announcement(milestone_data, subreddit)
             if result:
                 analytics.log_milestone_post(
                     milestone_data.get('type', 'general'),
                     milestone_data
                 )
         
+        elif action == 'milestone_enqueue':
+            # Batched: milestone_flush (cron) or the receiver's timer dispatches one workflow run per window
+            coalescer = init(get_milestone_coalescer)
+            due_at = coalescer.add(event.get('milestone_data', {}))
+            result = {'pending': len(coalescer.pending()), 'due_at': due_at}
+        
+        elif action == 'milestone_flush':
+            dispatch = init(get_milestone_coalescer).flush(force=bool(event.get('force')))
+            if dispatch is not None and not dispatch.get('success'):
+                raise RuntimeError(dispatch.get('error') or 'Milestone dispatch failed')
+            result = {'dispatched': dispatch is not None}
+        
         elif action == 'monitor_posts':
-            # For serverless, we'd typically process a batch of recent posts
-            # This would be triggered by a webhook or scheduled event
-            pass
+            # Scheduled batch: welcome everything posted since the last run
+            if get_config().ASYNC_ENGINE:
+                from .async_bot import AsyncCodeDAOBot
+                result = AsyncCodeDAOBot.run_sync('process_new_posts', event.get('max_posts'),
+                                                  config=get_config(), state=init(get_state))
+            else:
+                bot = init(get_bot)
+                result = bot.process_new_posts(event.get('max_posts'))
+            for welcome in result['welcomed']:
+                init(lambda: get_analytics(welcome.get('subreddit'))).log_welcome_message(
+                    welcome['username'], welcome['post_id'])
         
         elif action == 'analytics':
-            # Return analytics data
-            return {
-                'statusCode': 200,
-                'body': json.dumps(analytics.get_dashboard_data())
-            }
+            # Return analytics data (cached until the next logged event)
+            analytics = init(lambda: get_analytics(subreddit))
+            if_none_match = _get_header(event.get('headers'), 'If-None-Match') or event.get('if_none_match')
+            return finish(analytics_response(analytics, if_none_match))
+        
+        elif action == 'health':
+            result = warm_health()
+        
+        if store is not None:
+            if result:
+                store.complete(key, result if isinstance(result, dict) else str(result),
+                               config.IDEMPOTENCY_TTL_SECONDS)
+            else:
+                store.release(key)  # Nothing posted: let a retry try again
         
-        return {
+        return finish({
             'statusCode': 200,
-            'body': json.dumps({
+            'body': {
                 'success': True,
                 'action': action,
-                'result': str(result) if result else None,
+                'result': result if isinstance(result, dict) else (str(result) if result else None),
                 'timestamp': datetime.now().isoformat()
-            })
-        }
+            }
+        })
         
     except Exception as e:
-        return {
+        if store is not None:
+            store.release(key)
+        return finish({
             'statusCode': 500,
-            'body': json.dumps({
+            'body': {
                 'success': False,
                 'error': str(e),
                 'timestamp': datetime.now().isoformat()
-            })
-        }
+            }
+        })
 
 def vercel_handler(request):
     """Vercel serverless handler"""
+    if request.method == 'GET' and request.args.get('action') == 'analytics':
+        response = lambda_handler({
+            'action': 'analytics',
+            'subreddit': request.args.get('subreddit'),
+            'headers': dict(request.headers),
+            'source': 'vercel'
+        }, {})
+        return response['body'], response['statusCode'], response.get('headers', {})
+    
     if request.method == 'POST':
         try:
             data = request.get_json()
@@ -79,11 +323,15 @@ def vercel_handler(request):
             event = {
                 'action': data.get('action', 'weekly_thread'),
                 'milestone_data': data.get('milestone_data', {}),
+                'milestones': data.get('milestones'),
+                'subreddit': data.get('subreddit'),
+                'idempotency_key': data.get('idempotency_key') or request.headers.get('Idempotency-Key'),
+                'headers': dict(request.headers),
                 'source': 'vercel'
             }
             
             response = lambda_handler(event, {})
-            return response['body'], response['statusCode']
+            return response['body'], response['statusCode'], response.get('headers', {})
             
         except Exception as e:
             return json.dumps({'error': str(e)}), 500
@@ -92,20 +340,30 @@ def vercel_handler(request):
 
 def netlify_handler(event, context):
     """Netlify Functions handler"""
-    return lambda_handler(json.loads(event['body']), context)
+    if event.get('body'):
+        payload = json.loads(event['body'])
+    else:
+        payload = dict(event.get('queryStringParameters') or {})
+    payload['headers'] = event.get('headers', {})
+    return lambda_handler(payload, context)
 
 # Example cron configuration for different platforms:
 CRON_EXAMPLES = {
     "aws_eventbridge": {
         "weekly_thread": "cron(0 9 ? * MON *)",  # Monday 9 AM UTC
-        "analytics_update": "cron(0 */6 * * ? *)"  # Every 6 hours
+        "analytics_update": "cron(0 */6 * * ? *)",  # Every 6 hours
+        "monitor_posts": "cron(*/10 * * * ? *)",  # Batch-welcome new posts every 10 minutes
+        "milestone_flush": "cron(*/5 * * * ? *)"  # Dispatch queued milestones once their batch is due
     },
     "vercel_cron": {
         "weekly_thread": "0 9 * * 1",  # Monday 9 AM
-        "analytics_update": "0 */6 * * *"  # Every 6 hours
+        "analytics_update": "0 */6 * * *",  # Every 6 hours
+        "monitor_posts": "*/10 * * * *",  # Every 10 minutes
+        "milestone_flush": "*/5 * * * *"  # Every 5 minutes
     },
     "github_actions": {
         "weekly_thread": "0 9 * * 1",  # Monday 9 AM
-        "analytics_update": "0 */6 * * *"  # Every 6 hours
+        "analytics_update": "0 */6 * * *",  # Every 6 hours
+        "monitor_posts": "*/10 * * * *"  # Every 10 minutes
     }
 } 
\ No newline at end of file
@@ -0,0 +1,37 @@
+import json
+import os
+import threading
+from .storage import write_json_atomic
+
+class BotState:
+    """Small persisted key/value store for bot bookkeeping (high-water marks, indexes, budgets)"""
+    
+    def __init__(self, state_file="reddit_bot_state.json"):
+        self.state_file = state_file
+        self._lock = threading.Lock()
+        self.data = self.load()
+    
+    def load(self):
+        """Load state from disk"""
+        if os.path.exists(self.state_file):
+            with open(self.state_file, 'r') as f:
+                return json.load(f)
+        return {}
+    
+    def reload(self):
+        """Pick up writes made by other processes sharing the state file"""
+        with self._lock:
+            self.data = self.load()
+    
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+    
+    def set(self, key, value):
+        """Set one key and persist"""
+        self.update({key: value})
+    
+    def update(self, values):
+        """Set several keys and persist in a single write"""
+        with self._lock:
+            self.data.update(values)
+            write_json_atomic(self.state_file, self.data)
@@ -0,0 +1,158 @@
+import json
+import os
+
+
+def empty_analytics_data():
+    """Fresh analytics document"""
+    return {
+        "weekly_threads": [],
+        "welcome_messages": [],
+        "milestone_posts": [],
+        "user_interactions": {},
+        "subreddit_growth": [],
+        "engagement_metrics": {
+            "total_posts": 0,
+            "total_comments": 0,
+            "total_upvotes": 0
+        }
+    }
+
+
+def write_json_atomic(path, document, indent=None):
+    """Write a JSON document via a temp file so readers never see a partial file"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(document, f, indent=indent, default=str)
+    os.replace(tmp_path, path)
+
+
+class JSONFileStorage:
+    """Legacy backend: rewrites the whole JSON document on every event"""
+
+    def __init__(self, data_file="reddit_bot_analytics.json"):
+        self.data_file = data_file
+
+    def load(self):
+        """Return (data, events_to_replay)"""
+        if os.path.exists(self.data_file):
+            with open(self.data_file, 'r') as f:
+                return json.load(f), []
+        return None, []
+
+    def append(self, event, data):
+        """Persist one event (here: the full document it produced)"""
+        self.compact(data)
+
+    def compact(self, data):
+        """Write the full document"""
+        write_json_atomic(self.data_file, data, indent=2)
+
+    def changed_externally(self):
+        return False
+
+
+class EventLogStorage:
+    """Append-only JSON-lines event log, compacted into periodic snapshots.
+
+    Files live next to ``data_file``:
+      - ``<name>.snapshot.json``  {"seq": N, "data": {...}}
+      - ``<name>.events.jsonl``   one {"seq": n, "type": ..., "record": {...}} per line
+
+    Each event costs one appended line. Every ``compact_every`` events the
+    in-memory document is written as a new snapshot and the log is truncated.
+    Events carry a sequence number so a crash between writing the snapshot and
+    truncating the log never double-applies them.
+
+    A legacy ``data_file`` (the old full-rewrite JSON) found without a snapshot
+    is migrated on first load and renamed to ``<data_file>.migrated``.
+    """
+
+    def __init__(self, data_file="reddit_bot_analytics.json", compact_every=500):
+        base, _ = os.path.splitext(data_file)
+        self.legacy_file = data_file
+        self.snapshot_file = f"{base}.snapshot.json"
+        self.log_file = f"{base}.events.jsonl"
+        self.compact_every = compact_every
+        self.seq = 0
+        self._events_since_snapshot = 0
+        self._log_size = 0
+
+    def load(self):
+        """Return (snapshot_data, events_to_replay), migrating legacy JSON if needed"""
+        data = None
+        snapshot_seq = 0
+
+        if os.path.exists(self.snapshot_file):
+            with open(self.snapshot_file, 'r') as f:
+                snapshot = json.load(f)
+            data = snapshot["data"]
+            snapshot_seq = snapshot.get("seq", 0)
+        elif os.path.exists(self.legacy_file):
+            with open(self.legacy_file, 'r') as f:
+                data = json.load(f)
+            write_json_atomic(self.snapshot_file, {"seq": 0, "data": data})
+            os.replace(self.legacy_file, f"{self.legacy_file}.migrated")
+
+        events = []
+        self.seq = snapshot_seq
+        if os.path.exists(self.log_file):
+            with open(self.log_file, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        # Torn final line from an interrupted append
+                        continue
+                    if event["seq"] <= snapshot_seq:
+                        continue
+                    events.append(event)
+                    self.seq = event["seq"]
+            self._log_size = os.path.getsize(self.log_file)
+
+        self._events_since_snapshot = len(events)
+        return data, events
+
+    def append(self, event, data):
+        """Append one event line; compact when the log grows past compact_every"""
+        self.seq += 1
+        line = json.dumps(dict(event, seq=self.seq), default=str) + "\n"
+        with open(self.log_file, 'a') as f:
+            f.write(line)
+        self._log_size += len(line.encode('utf-8'))
+        self._events_since_snapshot += 1
+
+        if self.compact_every and self._events_since_snapshot >= self.compact_every:
+            self.compact(data)
+
+    def compact(self, data):
+        """Snapshot the current document and truncate the event log"""
+        write_json_atomic(self.snapshot_file, {"seq": self.seq, "data": data})
+        with open(self.log_file, 'w'):
+            pass
+        self._log_size = 0
+        self._events_since_snapshot = 0
+
+    def changed_externally(self):
+        """True if another process appended to or compacted the log since our last write"""
+        try:
+            return os.path.getsize(self.log_file) != self._log_size
+        except OSError:
+            return self._log_size != 0
+
+
+STORAGE_BACKENDS = {
+    "eventlog": EventLogStorage,
+    "json": JSONFileStorage,
+}
+
+
+def create_storage(backend="eventlog", data_file="reddit_bot_analytics.json", **kwargs):
+    """Build a storage backend by name"""
+    try:
+        storage_class = STORAGE_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown analytics storage backend: {backend}")
+    return storage_class(data_file, **kwargs)
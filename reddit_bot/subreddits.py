@@ -0,0 +1,42 @@
+from .authors import KnownAuthors
+from .ratelimit import RateLimiter
+
+
+class SubredditContext:
+    """Per-subreddit settings and bookkeeping for a multi-subreddit bot.
+
+    One process serves every subreddit in ``BotConfig.SUBREDDITS`` through a
+    single combined ``sub1+sub2`` listing/stream. Each subreddit keeps its own
+    config view, known-authors index and rate budget; the Reddit client(s), state
+    file and welcome queue are shared.
+    """
+
+    def __init__(self, config, state):
+        self.name = config.SUBREDDIT
+        self.config = config
+        self.known_authors = KnownAuthors(config.AUTHOR_INDEX_FILE)
+        # The first subreddit keeps the unpartitioned key so single-subreddit state carries over
+        state_key = RateLimiter.STATE_KEY
+        if config.PARTITIONED:
+            state_key = f"{state_key}:{self.name.lower()}"
+        self.rate_limiter = RateLimiter(config, state, state_key)
+        self.subreddit = None  # asyncpraw model, attached by AsyncCodeDAOBot.start()
+
+    def write(self, call, *args, budget=("actions",), **kwargs):
+        """Run one outbound Reddit write under this subreddit's rate limit"""
+        self.rate_limiter.acquire(budget, max_wait=self.config.RATE_LIMIT_MAX_WAIT)
+        return call(*args, **kwargs)
+
+    async def write_async(self, call, *args, budget=("actions",), **kwargs):
+        """Await one outbound Reddit write under this subreddit's rate limit"""
+        await self.rate_limiter.acquire_async(budget, max_wait=self.config.RATE_LIMIT_MAX_WAIT)
+        return await call(*args, **kwargs)
+
+
+def build_contexts(config, state):
+    """SubredditContext per configured subreddit, keyed by lowercased name"""
+    contexts = {}
+    for name in config.SUBREDDITS:
+        sub_config = config if name.lower() == config.SUBREDDIT.lower() else config.for_subreddit(name)
+        contexts[name.lower()] = SubredditContext(sub_config, state)
+    return contexts
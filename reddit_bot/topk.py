@@ -0,0 +1,80 @@
+import heapq
+
+
+class TopKIndex:
+    """Indexed min-heap holding the `capacity` users with the most interactions.
+
+    Counts only ever grow, so a user outside the heap enters exactly when their
+    count overtakes the heap minimum. Ties keep first-seen order, matching a
+    stable descending sort of the ``user_interactions`` dict.
+    """
+
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self._heap = []   # [count, -first_seen_rank, username]
+        self._pos = {}    # username -> index in _heap
+        self._rank = {}   # username -> first-seen order
+
+    def rebuild(self, counts):
+        """Rebuild from a username -> count mapping (insertion ordered)"""
+        self._rank = {}
+        entries = []
+        for rank, (username, count) in enumerate(counts.items()):
+            self._rank[username] = rank
+            entries.append((count, -rank, username))
+        self._heap = [list(entry) for entry in heapq.nlargest(self.capacity, entries)]
+        self._heap.reverse()  # ascending order is already a valid min-heap
+        self._pos = {entry[2]: i for i, entry in enumerate(self._heap)}
+
+    def update(self, username, count):
+        """Record a user's new (increased) interaction count"""
+        rank = self._rank.setdefault(username, len(self._rank))
+        heap = self._heap
+
+        index = self._pos.get(username)
+        if index is not None:
+            heap[index][0] = count
+            self._sift_down(index)
+        elif len(heap) < self.capacity:
+            heap.append([count, -rank, username])
+            self._pos[username] = len(heap) - 1
+            self._sift_up(len(heap) - 1)
+        elif (count, -rank) > (heap[0][0], heap[0][1]):
+            del self._pos[heap[0][2]]
+            heap[0] = [count, -rank, username]
+            self._pos[username] = 0
+            self._sift_down(0)
+
+    def top(self, n):
+        """Return the n busiest users as (username, count), n <= capacity"""
+        if n > self.capacity:
+            raise ValueError(f"top({n}) exceeds index capacity {self.capacity}")
+        return [(username, count) for count, _, username in heapq.nlargest(n, self._heap)]
+
+    def _swap(self, i, j):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._pos[heap[i][2]] = i
+        self._pos[heap[j][2]] = j
+
+    def _sift_up(self, index):
+        heap = self._heap
+        while index > 0:
+            parent = (index - 1) // 2
+            if heap[index][:2] >= heap[parent][:2]:
+                break
+            self._swap(index, parent)
+            index = parent
+
+    def _sift_down(self, index):
+        heap = self._heap
+        size = len(heap)
+        while True:
+            smallest = index
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < size and heap[child][:2] < heap[smallest][:2]:
+                    smallest = child
+            if smallest == index:
+                break
+            self._swap(index, smallest)
+            index = smallest
@@ -1,9 +1,11 @@
 import os
 import json
-import requests
 from datetime import datetime
 import hmac
 import hashlib
+from .github_session import get_session
+from .milestones import combine_milestones
+from .webhook_stream import parse_signed_json, verify_stream
 
 class GitHubActionsWebhook:
     """Integration to trigger GitHub Actions for Reddit bot via webhook"""
@@ -14,29 +16,30 @@ class GitHubActionsWebhook:
         self.repo_name = os.getenv("GITHUB_REPO_NAME", "codedao-extension")
         self.webhook_secret = os.getenv("REDDIT_WEBHOOK_SECRET", "")
     
-    def trigger_milestone_post(self, milestone_data):
-        """Trigger GitHub Actions to post a milestone"""
+    @property
+    def session(self):
+        """Shared keep-alive GitHub session (connection pool, retries, timeouts)"""
+        return get_session(self.github_token)
+    
+    def _dispatch_workflow(self, inputs):
+        """Fire reddit-bot.yml's workflow_dispatch; returns the API response"""
         if not self.github_token:
             raise ValueError("GITHUB_TOKEN environment variable required")
         
-        url = f"https://api.github.com/repos/{self.repo_owner}/{self.repo_name}/actions/workflows/reddit-bot.yml/dispatches"
-        
-        headers = {
-            "Authorization": f"token {self.github_token}",
-            "Accept": "application/vnd.github.v3+json",
-            "Content-Type": "application/json"
-        }
-        
+        path = f"repos/{self.repo_owner}/{self.repo_name}/actions/workflows/reddit-bot.yml/dispatches"
         payload = {
             "ref": "main",
-            "inputs": {
-                "action": "post_milestone",
-                "milestone_title": milestone_data.get("title", "CodeDAO Milestone"),
-                "milestone_description": milestone_data.get("description", "A new milestone has been reached!")
-            }
+            "inputs": inputs
         }
-        
-        response = requests.post(url, headers=headers, json=payload)
+        return self.session.post(path, json=payload)
+    
+    def trigger_milestone_post(self, milestone_data):
+        """Trigger GitHub Actions to post a milestone"""
+        response = self._dispatch_workflow({
+            "action": "milestone_post",
+            "milestone_title": milestone_data.get("title", "CodeDAO Milestone"),
+            "milestone_description": milestone_data.get("description", "A new milestone has been reached!")
+        })
         
         if response.status_code == 204:
             return {"success": True, "message": "Milestone post triggered successfully"}
@@ -46,27 +49,31 @@ class GitHubActionsWebhook:
                 "error": f"GitHub API error: {response.status_code} - {response.text}"
             }
     
-    def trigger_weekly_thread(self):
-        """Manually trigger weekly thread"""
-        if not self.github_token:
-            raise ValueError("GITHUB_TOKEN environment variable required")
-        
-        url = f"https://api.github.com/repos/{self.repo_owner}/{self.repo_name}/actions/workflows/reddit-bot.yml/dispatches"
+    def trigger_milestone_posts(self, milestones):
+        """Trigger one GitHub Actions run announcing a batch of milestones"""
+        if len(milestones) == 1:
+            return self.trigger_milestone_post(milestones[0])
+        combined = combine_milestones(milestones)
+        response = self._dispatch_workflow({
+            "action": "milestone_post",
+            "milestone_title": combined["title"],
+            "milestone_description": combined["description"],
+            "milestones": json.dumps(milestones)
+        })
         
-        headers = {
-            "Authorization": f"token {self.github_token}",
-            "Accept": "application/vnd.github.v3+json",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "ref": "main",
-            "inputs": {
-                "action": "weekly_thread"
+        if response.status_code == 204:
+            return {"success": True, "message": f"{len(milestones)} milestone posts triggered in one run"}
+        else:
+            return {
+                "success": False, 
+                "error": f"GitHub API error: {response.status_code} - {response.text}"
             }
-        }
-        
-        response = requests.post(url, headers=headers, json=payload)
+    
+    def trigger_weekly_thread(self):
+        """Manually trigger weekly thread"""
+        response = self._dispatch_workflow({
+            "action": "weekly_thread"
+        })
         
         if response.status_code == 204:
             return {"success": True, "message": "Weekly thread triggered successfully"}
@@ -101,12 +108,34 @@ class GitHubActionsWebhook:
         expected_signature = "sha256=" + hash_object.hexdigest()
         
         return hmac.compare_digest(expected_signature, signature_header)
+    
+    def verify_webhook_stream(self, stream, signature_header, content_length=None):
+        """verify_webhook_signature for a body still on the wire: hashed chunk by chunk"""
+        return verify_stream(stream, self.webhook_secret, signature_header, content_length)
+    
+    def parse_webhook_stream(self, stream, signature_header, content_length=None, prefixes=None):
+        """Verify and parse a JSON webhook body in one streaming pass (raises InvalidSignature)"""
+        return parse_signed_json(stream, self.webhook_secret, signature_header, content_length, prefixes)
 
 # Express.js style endpoint for your agent-gateway
 AGENT_GATEWAY_INTEGRATION = """
 // Add this to your agent-gateway/server.js
 
 // Reddit Bot Integration Endpoints
+const crypto = require('crypto');
+
+// Signed POST to the bot's action receiver (python -m reddit_bot.webhook_server)
+async function sendBotAction(event) {
+    const body = JSON.stringify(event);
+    const signature = 'sha256=' + crypto.createHmac('sha256', process.env.REDDIT_WEBHOOK_SECRET)
+        .update(body).digest('hex');
+    return fetch(`${process.env.REDDIT_BOT_URL || 'http://127.0.0.1:8080'}/actions`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', 'X-Hub-Signature-256': signature },
+        body
+    });
+}
+
 app.post('/api/reddit/milestone', async (req, res) => {
     try {
         const { title, description, details } = req.body;
@@ -116,29 +145,17 @@ app.post('/api/reddit/milestone', async (req, res) => {
             return res.status(400).json({ error: 'Title and description required' });
         }
         
-        // Call GitHub Actions webhook
-        const response = await fetch('https://api.github.com/repos/CodeDAO-org/codedao-extension/actions/workflows/reddit-bot.yml/dispatches', {
-            method: 'POST',
-            headers: {
-                'Authorization': `token ${process.env.GITHUB_TOKEN}`,
-                'Accept': 'application/vnd.github.v3+json',
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({
-                ref: 'main',
-                inputs: {
-                    action: 'post_milestone',
-                    milestone_title: title,
-                    milestone_description: description
-                }
-            })
+        // Queue it with the bot: milestones within REDDIT_MILESTONE_WINDOW go out as one workflow run
+        const response = await sendBotAction({
+            action: 'milestone_enqueue',
+            milestone_data: { title, description, details }
         });
         
-        if (response.status === 204) {
-            res.json({ success: true, message: 'Milestone post triggered' });
+        if (response.status === 202) {
+            res.json({ success: true, message: 'Milestone queued', job: await response.json() });
         } else {
             const error = await response.text();
-            res.status(500).json({ error: `GitHub API error: ${error}` });
+            res.status(500).json({ error: `Reddit bot error: ${error}` });
         }
         
     } catch (error) {
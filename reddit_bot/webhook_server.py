@@ -0,0 +1,258 @@
+"""Self-hosted HTTP receiver for bot actions.
+
+POST a Lambda-style event (``{"action": "milestone", "milestone_data": {...}}``)
+signed like a GitHub webhook (``X-Hub-Signature-256``). The receiver verifies
+it, answers 202 with a job id straight away and runs the action from a bounded
+queue through ``serverless_handler.lambda_handler``, so callers never wait on
+Reddit. A full queue answers 503 with Retry-After. Actions run one at a time:
+the handler's warm bot, Reddit client and analytics are process-wide and not
+thread-safe. Without REDDIT_WEBHOOK_SECRET the receiver only binds to loopback.
+
+    POST /actions        -> 202 {"job_id": ..., "status_url": "/jobs/<id>"}
+    GET  /jobs/<id>      -> {"status": "queued|running|succeeded|failed", ...}
+    GET  /health         -> queue depth, workers, job counts
+
+Run with ``python -m reddit_bot.webhook_server``.
+"""
+import json
+import logging
+import os
+import queue
+import signal
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from .webhook_integration import GitHubActionsWebhook
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 1024 * 1024
+LOOPBACK_HOSTS = ("127.0.0.1", "::1", "localhost")
+
+
+def serialized(handler):
+    """Wrap a handler so concurrent workers call it one at a time"""
+    lock = threading.Lock()
+
+    def run(event, context):
+        with lock:
+            return handler(event, context)
+    return run
+
+
+class JobQueue:
+    """Bounded queue of actions drained by a fixed pool of worker threads"""
+
+    def __init__(self, handler, workers=1, max_pending=100, max_finished=1000):
+        self.handler = handler
+        self.max_finished = max_finished
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._jobs = OrderedDict()  # job_id -> job dict, oldest first
+        self._lock = threading.Lock()
+        self._threads = [threading.Thread(target=self._work, name=f"action-worker-{i}", daemon=True)
+                         for i in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, event):
+        """Queue an event; returns its job id, or None when the queue is full"""
+        job_id = uuid.uuid4().hex
+        job = {"id": job_id, "action": event.get("action"), "status": "queued",
+               "created_at": time.time(), "started_at": None, "finished_at": None, "result": None}
+        with self._lock:
+            self._jobs[job_id] = job
+        try:
+            self._queue.put_nowait((job_id, event))
+        except queue.Full:
+            with self._lock:
+                del self._jobs[job_id]
+            return None
+        return job_id
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def stats(self):
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return {"pending": self._queue.qsize(), "capacity": self._queue.maxsize,
+                "workers": len(self._threads), "jobs": counts}
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+
+    def _evict(self):
+        # Forget the oldest finished jobs beyond max_finished
+        finished = [job_id for job_id, job in self._jobs.items() if job["finished_at"] is not None]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            job_id, event = item
+            self._update(job_id, status="running", started_at=time.time())
+            try:
+                response = self.handler(event, None)
+                body = json.loads(response.get("body") or "null")
+                status = "succeeded" if response.get("statusCode", 500) < 400 else "failed"
+                self._update(job_id, status=status, result=body, finished_at=time.time())
+            except Exception as e:
+                logger.error(f"Job {job_id} failed: {e}")
+                self._update(job_id, status="failed", result={"error": str(e)}, finished_at=time.time())
+            with self._lock:
+                self._evict()
+            self._queue.task_done()
+
+    def shutdown(self, wait=True):
+        """Stop the workers once the jobs already queued have run"""
+        for _ in self._threads:
+            self._queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+
+class ActionRequestHandler(BaseHTTPRequestHandler):
+    server_version = "CodeDAOBotReceiver/1.0"
+
+    def log_message(self, format, *args):
+        logger.info("%s - %s" % (self.address_string(), format % args))
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        jobs = self.server.jobs
+        if self.path == "/health":
+            self._send_json(200, jobs.stats())
+        elif self.path.startswith("/jobs/"):
+            job = jobs.get(self.path[len("/jobs/"):])
+            if job is None:
+                self._send_json(404, {"error": "Unknown job"})
+            else:
+                self._send_json(200, job)
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if self.path not in ("/", "/actions"):
+            self._send_json(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._send_json(400, {"error": "Invalid Content-Length"})
+            return
+        if length > MAX_BODY_BYTES:
+            self._send_json(413, {"error": f"Body larger than {MAX_BODY_BYTES} bytes"})
+            return
+        body = self.rfile.read(length)
+        if not self.server.webhook.verify_webhook_signature(body, self.headers.get("X-Hub-Signature-256")):
+            self._send_json(401, {"error": "Invalid signature"})
+            return
+        try:
+            event = json.loads(body or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": "Body must be JSON"})
+            return
+        if not isinstance(event, dict) or not event.get("action"):
+            self._send_json(400, {"error": "Missing action"})
+            return
+
+        event.setdefault("source", "receiver")
+        job_id = self.server.jobs.submit(event)
+        if job_id is None:
+            self._send_json(503, {"error": "Action queue full"}, {"Retry-After": "5"})
+            return
+        self._send_json(202, {"job_id": job_id, "status_url": f"/jobs/{job_id}"},
+                        {"Location": f"/jobs/{job_id}"})
+
+
+class ActionReceiver(ThreadingHTTPServer):
+    """HTTP server owning the job queue and the webhook signature checker.
+
+    Refuses (ValueError) to listen beyond loopback without a webhook secret,
+    since anyone who can reach it could then post as the bot.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, handler=None, workers=1, max_pending=100, webhook=None):
+        self.webhook = webhook or GitHubActionsWebhook()
+        if not self.webhook.webhook_secret and address[0] not in LOOPBACK_HOSTS:
+            raise ValueError(f"REDDIT_WEBHOOK_SECRET is required to listen on {address[0] or 'all interfaces'}; "
+                             "set it or bind to 127.0.0.1")
+        super().__init__(address, ActionRequestHandler)
+        if handler is None:
+            from .serverless_handler import lambda_handler
+            handler = serialized(lambda_handler)
+        self.jobs = JobQueue(handler, workers=workers, max_pending=max_pending)
+
+    def stop(self):
+        """Stop accepting requests, then let queued jobs finish"""
+        self.shutdown()
+        self.jobs.shutdown()
+        self.server_close()
+
+
+def serve(host=None, port=None, workers=None, max_pending=None):
+    """Run the receiver until SIGINT/SIGTERM"""
+    from .bot import setup_logging
+    from .config import load_environment
+    load_environment()
+    setup_logging()
+    try:
+        server = ActionReceiver(
+            (host or os.getenv("REDDIT_RECEIVER_HOST", "0.0.0.0"), port or int(os.getenv("REDDIT_RECEIVER_PORT", "8080"))),
+            workers=workers or int(os.getenv("REDDIT_RECEIVER_WORKERS", "1")),
+            max_pending=max_pending or int(os.getenv("REDDIT_RECEIVER_QUEUE", "100")),
+        )
+    except ValueError as e:
+        raise SystemExit(str(e))
+    if not server.webhook.webhook_secret:
+        logger.warning("REDDIT_WEBHOOK_SECRET is not set: accepting unsigned requests on loopback only")
+    # milestone_enqueue batches are dispatched on a timer here, no milestone_flush cron needed
+    from .serverless_handler import get_milestone_coalescer
+    milestones = get_milestone_coalescer()
+    milestones.start()
+
+    def handle_signal(*_):
+        # shutdown() blocks until serve_forever returns, so call it off the main thread
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+    logger.info(f"Action receiver listening on {server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    finally:
+        milestones.stop()
+        logger.info("Draining queued actions...")
+        server.jobs.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,234 @@
+import logging
+import sqlite3
+import threading
+import time
+from .ratelimit import RateLimitExceeded
+
+logger = logging.getLogger(__name__)
+
+class WelcomeQueue:
+    """Persistent delay queue of pending welcome replies, ordered by due time.
+
+    Backed by SQLite (WAL) with an index on the due time, so the earliest
+    item is an index seek and pending welcomes survive restarts. Safe to
+    share between the stream thread (enqueue) and the worker thread (drain).
+
+    Draining leases rather than removes: claim_due() hides items for
+    LEASE_SECONDS, and they are only deleted by ack() once handled. An item
+    whose drain died mid-way (crash, serverless timeout) comes back when
+    its lease runs out. fail() counts failed attempts and moves an item that
+    keeps failing to the failed_welcomes table instead of retrying it forever.
+    """
+
+    LEASE_SECONDS = 300
+
+    def __init__(self, db_file="reddit_bot_welcomes.db"):
+        self.db_file = db_file
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS pending_welcomes ("
+            " post_id TEXT PRIMARY KEY, author TEXT NOT NULL, due REAL NOT NULL, claimed_until REAL,"
+            " subreddit TEXT NOT NULL DEFAULT '')"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS pending_welcomes_due ON pending_welcomes (due)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS failed_welcomes ("
+            " post_id TEXT PRIMARY KEY, author TEXT NOT NULL, subreddit TEXT NOT NULL, attempts INTEGER NOT NULL,"
+            " error TEXT, failed_at REAL NOT NULL)"
+        )
+        self._add_column("claimed_until REAL")
+        self._add_column("subreddit TEXT NOT NULL DEFAULT ''")
+        self._add_column("attempts INTEGER NOT NULL DEFAULT 0")
+
+    def _add_column(self, definition):
+        """Bring a queue file created by an older version up to the current schema"""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(pending_welcomes)")}
+        if definition.split()[0] not in columns:
+            try:
+                self.conn.execute(f"ALTER TABLE pending_welcomes ADD COLUMN {definition}")
+            except sqlite3.OperationalError as e:
+                if "duplicate column" not in str(e):  # Another process migrated first
+                    raise
+
+    def enqueue(self, post_id, author, due, subreddit=""):
+        """Schedule a welcome; re-enqueueing the same post is a no-op"""
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO pending_welcomes (post_id, author, due, subreddit) VALUES (?, ?, ?, ?)",
+                (post_id, author, due, subreddit.lower())
+            )
+
+    def requeue(self, items, due, subreddit=None):
+        """Release claimed (post_id, author) items with a new due time (and subreddit, if given)"""
+        with self._lock:
+            self.conn.executemany(
+                "UPDATE pending_welcomes SET due = ?, claimed_until = NULL, subreddit = COALESCE(?, subreddit)"
+                " WHERE post_id = ?",
+                [(due, subreddit and subreddit.lower(), post_id) for post_id, _ in items]
+            )
+
+    def fail(self, post_id, due, max_attempts, error=""):
+        """Count a failed attempt on a claimed item and release it for `due`.
+
+        Once it has failed `max_attempts` times it is moved to failed_welcomes
+        instead (dead-lettered); returns True in that case.
+        """
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.execute(
+                    "UPDATE pending_welcomes SET attempts = attempts + 1, due = ?, claimed_until = NULL"
+                    " WHERE post_id = ?", (due, post_id)
+                )
+                moved = self.conn.execute(
+                    "INSERT OR REPLACE INTO failed_welcomes (post_id, author, subreddit, attempts, error, failed_at)"
+                    " SELECT post_id, author, subreddit, attempts, ?, ? FROM pending_welcomes"
+                    " WHERE post_id = ? AND attempts >= ?", (error, time.time(), post_id, max_attempts)
+                ).rowcount
+                if moved:
+                    self.conn.execute("DELETE FROM pending_welcomes WHERE post_id = ?", (post_id,))
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return bool(moved)
+
+    def claim_due(self, limit=25, now=None, lease=None, exclude=()):
+        """Atomically lease and return up to `limit` due, unclaimed (post_id, author) items, earliest first.
+
+        Items of the subreddits in `exclude` are left alone.
+        """
+        now = time.time() if now is None else now
+        claimed_until = now + (self.LEASE_SECONDS if lease is None else lease)
+        exclude = [name.lower() for name in exclude]
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self.conn.execute(
+                    "SELECT post_id, author FROM pending_welcomes"
+                    " WHERE due <= ? AND (claimed_until IS NULL OR claimed_until <= ?)"
+                    f" AND subreddit NOT IN ({', '.join('?' * len(exclude))}) ORDER BY due LIMIT ?",
+                    (now, now, *exclude, limit)
+                ).fetchall()
+                self.conn.executemany("UPDATE pending_welcomes SET claimed_until = ? WHERE post_id = ?",
+                                      [(claimed_until, post_id) for post_id, _ in rows])
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return rows
+
+    def ack(self, post_ids):
+        """Remove handled items for good"""
+        with self._lock:
+            self.conn.executemany("DELETE FROM pending_welcomes WHERE post_id = ?",
+                                  [(post_id,) for post_id in post_ids])
+
+    def next_due(self):
+        """When the earliest pending welcome can next be claimed, or None if the queue is empty"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT MIN(MAX(due, COALESCE(claimed_until, 0))) FROM pending_welcomes"
+            ).fetchone()
+        return row[0]
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM pending_welcomes").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+# Errors that retrying cannot fix: the post or author is gone, the thread is
+# locked or archived, or the bot may not reply there
+PERMANENT_STATUSES = {403, 404}
+PERMANENT_API_ERRORS = {"THREAD_LOCKED", "TOO_OLD", "DELETED_LINK", "DELETED_COMMENT", "USER_BLOCKED"}
+
+def is_permanent_error(error):
+    """True for a (async)praw error that will fail the same way on every retry"""
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None) or getattr(response, "status", None)
+    if status in PERMANENT_STATUSES:
+        return True
+    items = getattr(error, "items", None)  # RedditAPIException's RedditErrorItems
+    return isinstance(items, list) and any(getattr(item, "error_type", None) in PERMANENT_API_ERRORS
+                                           for item in items)
+
+class WelcomeDrain:
+    """Bookkeeping for one pass over the due welcomes, shared by both bot engines.
+
+    The engine claims a batch, fetches its submissions (one /api/info
+    request), attempts the welcomes attempts() yields and reports each
+    result to settle(). An item leaves the queue once it is welcomed, needs
+    no welcome, its post is gone or it hit a permanent error (see
+    is_permanent_error); one that failed otherwise goes back on the queue for
+    RETRY_SECONDS later, and after MAX_ATTEMPTS failures is dead-lettered.
+    When a subreddit's welcome budget runs
+    out (RateLimitExceeded) it is left out of further claims for the rest of
+    the pass and its items wait for when budget is available again; other
+    subreddits keep draining.
+    """
+
+    RETRY_SECONDS = 300
+    MAX_ATTEMPTS = 5
+
+    def __init__(self, queue, contexts, batch_size):
+        self.queue = queue
+        self.contexts = contexts
+        self.batch_size = batch_size
+        self.retry_at = {}  # subreddit -> when its budget allows another welcome
+        self.welcomed = []
+
+    def next_batch(self):
+        """Claim the next due (post_id, author) items; [] once none are due or every budget is spent"""
+        if self.retry_at and len(self.retry_at) == len(self.contexts):
+            return []
+        return self.queue.claim_due(self.batch_size, exclude=self.retry_at)
+
+    @staticmethod
+    def fullnames(batch):
+        return [f"t3_{post_id}" for post_id, _ in batch]
+
+    def retry_later(self, items):
+        """Give claimed items back, e.g. when their /api/info request failed"""
+        self.queue.requeue(items, time.time() + self.RETRY_SECONDS)
+
+    def attempts(self, batch, submissions, context_for):
+        """Yield (item, submission, context) to attempt, settling deleted posts and deferred subreddits.
+
+        A generator, so a subreddit deferred while the sync engine walks the
+        batch is skipped for the rest of it.
+        """
+        for item in batch:
+            submission = submissions.get(item[0])
+            if submission is None:
+                self.queue.ack([item[0]])  # Deleted since it was queued
+                continue
+            context = context_for(submission)
+            if context.name in self.retry_at:
+                self.queue.requeue([item], self.retry_at[context.name], context.name)
+                continue
+            yield item, submission, context
+
+    def settle(self, item, context, result):
+        """Record one attempt: True (sent), False (not needed) or the exception it raised"""
+        post_id, author = item
+        if isinstance(result, RateLimitExceeded):
+            if context.name not in self.retry_at:
+                self.retry_at[context.name] = time.time() + context.rate_limiter.wait_time(("actions", "welcome"))
+                logger.info(f"Welcome budget exhausted in r/{context.name}, deferring its welcomes")
+            self.queue.requeue([item], self.retry_at[context.name], context.name)
+        elif isinstance(result, BaseException) and is_permanent_error(result):
+            logger.warning(f"Dropping welcome to {author} ({post_id}), it cannot succeed: {result}")
+            self.queue.ack([post_id])
+        elif isinstance(result, BaseException):
+            if self.queue.fail(post_id, time.time() + self.RETRY_SECONDS, self.MAX_ATTEMPTS, repr(result)):
+                logger.error(f"Giving up on welcome to {author} ({post_id}) after {self.MAX_ATTEMPTS} attempts: {result}")
+            else:
+                logger.error(f"Error sending welcome message to {author}, retrying later: {result}")
+        else:
+            self.queue.ack([post_id])
+            if result:
+                self.welcomed.append({"username": author, "post_id": post_id, "subreddit": context.name})
@@ -31,12 +31,12 @@ echo "✅ Setup complete!"
 echo ""
 echo "🔧 Available commands:"
 echo "  python bot.py                    # Simple test"
-echo "  python reddit_bot/bot.py         # Full bot with automation"
+echo "  python -m reddit_bot.bot         # Full bot with automation"
 echo ""
 echo "📖 Next steps:"
 echo "  1. Make sure u/CodeDAOAgent is a moderator of r/CodeDAO"
 echo "  2. Test with: python bot.py"
-echo "  3. Run full bot: python reddit_bot/bot.py"
+echo "  3. Run full bot: python -m reddit_bot.bot"
 echo ""
 echo "🌐 Production deployment:"
 echo "  - Deploy to Render/Railway/DigitalOcean"
@@ -5,8 +5,11 @@
 Tests the core value proposition: AI agents helping users push code to earn CODE tokens
 """
 
-import requests
-import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'codedao-org.github.io'))
+from agent_gateway import AgentGatewayClient, GatewayError
 
 def test_ai_agent_push():
     print("🤖 Testing CodeDAO AI Agent GitHub Push System")
@@ -21,37 +24,24 @@ def test_ai_agent_push():
         print(f"❌ Error reading dashboard: {e}")
         return False
     
-    # Prepare AI Agent push request
-    url = 'http://localhost:3001/api/github/push'
-    payload = {
-        "userId": "ai-agent-codedao",
-        "repo": "CodeDAO-org.github.io", 
-        "files": [{
-            "path": "dashboard-working.html",
-            "content": content
-        }],
-        "commitMessage": "🤖 AI Agent: Autonomous deployment - User earning CODE tokens"
-    }
-    
-    headers = {'Content-Type': 'application/json'}
-    
     print("🚀 Pushing via AI Agent...")
-    try:
-        response = requests.post(url, json=payload, headers=headers, timeout=30)
-        print(f"📊 Status: {response.status_code}")
-        print(f"📋 Response: {response.text}")
-        
-        if response.status_code == 200:
+    with AgentGatewayClient(user_id="ai-agent-codedao", timeout=(5, 30)) as gateway:
+        try:
+            response_data = gateway.push(
+                "CodeDAO-org.github.io",
+                [{
+                    "path": "dashboard-working.html",
+                    "content": content
+                }],
+                "🤖 AI Agent: Autonomous deployment - User earning CODE tokens"
+            )
+            print(f"📋 Response: {response_data}")
             print("✅ AI Agent Push Successful!")
             print("🔗 Check: https://codedao-org.github.io/dashboard-working.html")
             return True
-        else:
-            print("❌ AI Agent Push Failed")
+        except GatewayError as e:
+            print(f"❌ AI Agent Push Failed: {e}")
             return False
-            
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        return False
 
 if __name__ == "__main__":
     test_ai_agent_push() 
\ No newline at end of file
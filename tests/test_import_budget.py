@@ -0,0 +1,28 @@
+"""Cold-start import budget for the read-only serverless actions.
+
+The analytics and health actions must not pull in the Reddit/HTTP stack
+(praw, requests, dotenv, ...); see reddit_bot.benchmarks.bench_import_budget.
+"""
+import pytest
+
+from reddit_bot.benchmarks import (HEAVY_MODULES, READ_ONLY_ACTIONS, READ_ONLY_IMPORT_BUDGET_MS,
+                                   _ACTION_PROBES, _import_profile, _probe_env)
+
+
+@pytest.fixture(scope="module")
+def probe_env(tmp_path_factory):
+    return _probe_env(str(tmp_path_factory.mktemp("import_budget")))
+
+
+@pytest.mark.parametrize("action", READ_ONLY_ACTIONS)
+def test_read_only_action_skips_heavy_imports(action, probe_env):
+    modules, _ = _import_profile(_ACTION_PROBES[action], probe_env)
+    assert [name for name in HEAVY_MODULES if name in modules] == []
+
+
+@pytest.mark.parametrize("action", READ_ONLY_ACTIONS)
+def test_read_only_action_within_import_budget(action, probe_env):
+    # Best of three, so one slow run on a busy machine doesn't fail the budget
+    baseline_ms = min(_import_profile("pass", probe_env)[1] for _ in range(3))
+    cost_ms = min(_import_profile(_ACTION_PROBES[action], probe_env)[1] for _ in range(3)) - baseline_ms
+    assert cost_ms <= READ_ONLY_IMPORT_BUDGET_MS